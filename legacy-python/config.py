@@ -117,6 +117,13 @@ SQL_SERVER_CONNECTION_STRING = (
     "TrustServerCertificate=yes;"
 )
 
+# Bounds for the SQL Server connection pool in db_connectors. min_size
+# connections are opened up front; pooled connections older than the recycle
+# age (seconds) are closed and reopened on checkout.
+SQL_POOL_MIN_SIZE = int(os.getenv("SQL_POOL_MIN_SIZE", "4"))
+SQL_POOL_MAX_SIZE = int(os.getenv("SQL_POOL_MAX_SIZE", "32"))
+SQL_POOL_RECYCLE = int(os.getenv("SQL_POOL_RECYCLE", "1800"))
+
 # --- Milvus Configuration ---
 # Read all possible Milvus variables from .env
 MILVUS_HOST = os.getenv("MILVUS_HOST")
@@ -256,6 +263,8 @@ OLLAMA_MODELS = {
 MAX_REQUEST_SIZE = int(os.getenv("MAX_REQUEST_SIZE", "10485760"))  # 10MB
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "300"))  # 5 minutes
 CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))  # 1 hour
+VECTOR_SEARCH_CACHE_SIZE = int(os.getenv("VECTOR_SEARCH_CACHE_SIZE", "1024"))
+VECTOR_SEARCH_CACHE_TTL = float(os.getenv("VECTOR_SEARCH_CACHE_TTL", "60"))  # seconds
 MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "100"))
 
 # Feature flags
@@ -2,6 +2,7 @@ import asyncio
 import json
 import logging
 import traceback
+import weakref
 from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any
 from functools import wraps
@@ -20,6 +21,9 @@ from config import (
     NEO4J_PASSWORD,
     NEO4J_URI,
     NEO4J_USER,
+    SQL_POOL_MAX_SIZE,
+    SQL_POOL_MIN_SIZE,
+    SQL_POOL_RECYCLE,
     SQL_SERVER_CONNECTION_STRING,
 )
 from query_utils import (
@@ -31,8 +35,12 @@ from query_utils import (
 logger = logging.getLogger(__name__)
 
 # Connection pools and state management
-_sql_connection_pool = None
-_neo4j_driver_pool = None
+# One SQL Server pool per event loop: asyncio.Queue waiters are loop-bound.
+_sql_connection_pools: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+# Long-lived clients shared by every query and health check; callers must not
+# close them (see close_shared_connections). The async Neo4j driver is
+# loop-bound, so one per loop.
+_neo4j_driver_pool: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
 _milvus_client_pool = None
 
 # Circuit breaker state
@@ -103,22 +111,66 @@ def circuit_breaker(service_name: str):
 
 
 class SQLServerConnectionManager:
-    def __init__(self, connection_string, pool_size: int = 10):
+    def __init__(
+        self,
+        connection_string,
+        pool_size: int = SQL_POOL_MAX_SIZE,
+        min_size: int = SQL_POOL_MIN_SIZE,
+        recycle: float = SQL_POOL_RECYCLE,
+    ):
         self.connection_string = connection_string
         self.pool_size = pool_size
-        self.conn = None
+        self.min_size = min(min_size, pool_size)
+        self.recycle = recycle
         self._pool = asyncio.Queue(maxsize=pool_size)
         self._pool_initialized = False
+        self._init_lock = asyncio.Lock()
+        self._open_connections = 0
+        # id(conn) -> monotonic open time, for recycling
+        self._opened_at: Dict[int, float] = {}
+        # Connections checked out via ``async with manager``, per task, so one
+        # shared manager can serve concurrent callers.
+        self._active: Dict[asyncio.Task, list] = {}
+        # Set by close(); connections released afterwards are closed, not pooled
+        self._closed = False
+
+    async def _connect(self):
+        # Reserve the slot before the blocking connect so concurrent callers
+        # cannot overshoot pool_size.
+        self._open_connections += 1
+        try:
+            conn = await asyncio.to_thread(pyodbc.connect, self.connection_string)
+        except BaseException:
+            self._open_connections -= 1
+            raise
+        self._opened_at[id(conn)] = time.monotonic()
+        return conn
+
+    async def _discard(self, conn):
+        """Close a connection and free its slot."""
+        self._open_connections -= 1
+        self._opened_at.pop(id(conn), None)
+        try:
+            await asyncio.to_thread(conn.close)
+        except Exception as e:
+            logger.error(f"Error closing SQL Server connection: {e}")
+
+    def _expired(self, conn) -> bool:
+        if getattr(conn, "closed", False):
+            return True
+        opened_at = self._opened_at.get(id(conn))
+        return opened_at is not None and time.monotonic() - opened_at > self.recycle
 
     async def _initialize_pool(self):
-        """Initialize connection pool lazily."""
-        if not self._pool_initialized:
-            for _ in range(self.pool_size):
+        """Open the first min_size connections; the rest are opened on demand."""
+        if self._pool_initialized:
+            return
+        async with self._init_lock:
+            if self._pool_initialized:
+                return
+            for _ in range(self.min_size):
                 try:
-                    conn = await asyncio.to_thread(
-                        pyodbc.connect, self.connection_string
-                    )
-                    await self._pool.put(conn)
+                    self._pool.put_nowait(await self._connect())
                 except Exception as e:
                     logger.error(f"Failed to create SQL Server connection: {e}")
                     break
@@ -127,35 +179,74 @@ class SQLServerConnectionManager:
                 f"SQL Server connection pool initialized with {self._pool.qsize()} connections"
             )
 
-    async def __aenter__(self):
+    async def _checkout(self):
+        """Take a live connection from the pool, opening one if below capacity."""
         await self._initialize_pool()
+        while True:
+            # get_nowait claims an idle connection atomically; checking empty()
+            # first would let a burst of callers all queue on the same few.
+            try:
+                conn = self._pool.get_nowait()
+            except asyncio.QueueEmpty:
+                if self._open_connections < self.pool_size:
+                    return await self._connect()
+                try:
+                    conn = await asyncio.wait_for(self._pool.get(), timeout=30)
+                except asyncio.TimeoutError:
+                    raise ConnectionError("Timeout getting connection from SQL Server pool")
+            if not self._expired(conn):
+                return conn
+            # Dead or past its recycle age: drop it and let the loop reopen
+            await self._discard(conn)
+
+    async def _release(self, conn, healthy: bool):
+        """Commit and return a connection to the pool, or roll back and close it.
+
+        Once the manager is closed, committed connections are closed too.
+        """
         try:
-            self.conn = await asyncio.wait_for(self._pool.get(), timeout=30)
-            return self.conn
-        except asyncio.TimeoutError:
-            raise ConnectionError("Timeout getting connection from SQL Server pool")
+            if healthy:
+                await asyncio.to_thread(conn.commit)
+                if not self._closed:
+                    self._pool.put_nowait(conn)
+                    return
+            else:
+                await asyncio.to_thread(conn.rollback)
         except Exception as e:
-            logger.error(f"Error getting SQL Server connection: {e}")
-            # Fallback to direct connection
-            self.conn = await asyncio.to_thread(pyodbc.connect, self.connection_string)
-            return self.conn
+            logger.error(f"Error returning connection to pool: {e}")
+        await self._discard(conn)
 
-    async def __aexit__(self, exc_type, exc, tb):
-        if self.conn:
-            try:
-                if exc_type:
-                    await asyncio.to_thread(self.conn.rollback)
-                else:
-                    await asyncio.to_thread(self.conn.commit)
+    @asynccontextmanager
+    async def acquire(self):
+        """Check a connection out of the pool for the duration of the block."""
+        conn = await self._checkout()
+        try:
+            yield conn
+        except BaseException:
+            await self._release(conn, healthy=False)
+            raise
+        await self._release(conn, healthy=True)
+
+    async def close(self):
+        """Close every idle connection; checked-out ones close on release."""
+        self._closed = True
+        while not self._pool.empty():
+            await self._discard(self._pool.get_nowait())
+        self._pool_initialized = False
 
-                # Return to pool if healthy
-                if not exc_type and self._pool.qsize() < self.pool_size:
-                    await self._pool.put(self.conn)
-                else:
-                    await asyncio.to_thread(self.conn.close)
-            except Exception as e:
-                logger.error(f"Error returning connection to pool: {e}")
-                await asyncio.to_thread(self.conn.close)
+    async def __aenter__(self):
+        checkout = self.acquire()
+        conn = await checkout.__aenter__()
+        self._active.setdefault(asyncio.current_task(), []).append(checkout)
+        return conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        task = asyncio.current_task()
+        checkouts = self._active[task]
+        checkout = checkouts.pop()
+        if not checkouts:
+            del self._active[task]
+        return await checkout.__aexit__(exc_type, exc, tb)
 
 
 @circuit_breaker("sql_server")
@@ -167,8 +258,12 @@ async def get_sql_server_connection():
         async with connection_manager as conn:
             ...
     """
-    # Initialize and return the connection manager
-    manager = SQLServerConnectionManager(SQL_SERVER_CONNECTION_STRING)
+    # Reuse this loop's pool instead of opening pool_size connections per call
+    loop = asyncio.get_running_loop()
+    manager = _sql_connection_pools.get(loop)
+    if manager is None:
+        manager = SQLServerConnectionManager(SQL_SERVER_CONNECTION_STRING)
+        _sql_connection_pools[loop] = manager
     await manager._initialize_pool()
     return manager
 
@@ -208,6 +303,51 @@ async def get_neo4j_driver() -> Optional[Driver]:
         return None
 
 
+async def get_shared_milvus_client() -> Optional[MilvusClient]:
+    """Process-wide Milvus client, connected on first use. Do not close it."""
+    global _milvus_client_pool
+    if _milvus_client_pool is None:
+        client = await get_milvus_client()
+        if client is None:
+            return None
+        if _milvus_client_pool is None:
+            _milvus_client_pool = client
+        elif client is not _milvus_client_pool:
+            # Lost a concurrent first-use race; keep the winner
+            await asyncio.to_thread(client.close)
+    return _milvus_client_pool
+
+
+async def get_shared_neo4j_driver() -> Optional[Driver]:
+    """This event loop's Neo4j driver, connected on first use. Do not close it."""
+    loop = asyncio.get_running_loop()
+    driver = _neo4j_driver_pool.get(loop)
+    if driver is None:
+        driver = await get_neo4j_driver()
+        if driver is None:
+            return None
+        shared = _neo4j_driver_pool.setdefault(loop, driver)
+        if shared is not driver:
+            await driver.close()
+            driver = shared
+    return driver
+
+
+async def close_shared_connections() -> None:
+    """Close the shared Milvus client and this loop's Neo4j driver and SQL pool."""
+    global _milvus_client_pool
+    loop = asyncio.get_running_loop()
+    client, _milvus_client_pool = _milvus_client_pool, None
+    if client is not None:
+        await asyncio.to_thread(client.close)
+    driver = _neo4j_driver_pool.pop(loop, None)
+    if driver is not None:
+        await driver.close()
+    manager = _sql_connection_pools.pop(loop, None)
+    if manager is not None:
+        await manager.close()
+
+
 async def update_agent_log_evaluation(cursor, log_id: int, new_entry: dict) -> bool:
     """
     Retrieves existing Evaluation JSON from AgentLogs, appends a new entry,
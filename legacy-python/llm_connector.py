@@ -1,5 +1,7 @@
+import asyncio
 import os
 import logging
+from typing import List
 from abc import ABC, abstractmethod
 import google.generativeai as genai
 import anthropic
@@ -86,7 +88,8 @@ class ClaudeClient(BaseLLMClient):
             )
             return
         self.api_key_missing = False
-        self.client = anthropic.Anthropic(api_key=api_key)
+        # Async client: messages.create is awaited, and batched prompts overlap
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
         logging.info(f"Claude client initialized for model '{CLAUDE_MODEL_NAME}'.")
 
     async def invoke(
@@ -134,8 +137,13 @@ class HuggingFaceClient(BaseLLMClient):
         logging.info(
             f"Invoking Llama (HF) with model '{LLAMA_MODEL_NAME}', temp={temp}, max_tokens={max_t}"
         )
-        response = self.client.text_generation(
-            prompt, max_new_tokens=max_t, temperature=temp
+        # InferenceClient is blocking; run it in a thread so concurrent
+        # invocations (e.g. invoke_batch) do not serialize on the event loop.
+        response = await asyncio.to_thread(
+            self.client.text_generation,
+            prompt,
+            max_new_tokens=max_t,
+            temperature=temp,
         )
         return response
 
@@ -345,6 +353,21 @@ class LLMClient:
             logging.error("All LLM clients failed!")
             return f"Error: All LLM clients failed. Primary error: {primary_error}"
 
+    async def invoke_batch(
+        self, prompts: List[str], temperature: float = None, max_tokens: int = None
+    ) -> List[str]:
+        """Invoke LLM on several prompts in one call, returning responses in order.
+
+        The configured backends only expose single-prompt APIs, so prompts are
+        dispatched concurrently (every backend's ``invoke`` is non-blocking);
+        each one keeps the usual fallback handling.
+        """
+        return list(
+            await asyncio.gather(
+                *(self.invoke(prompt, temperature, max_tokens) for prompt in prompts)
+            )
+        )
+
     def get_available_models(self) -> dict:
         """Get information about available models."""
         models = {}
@@ -380,3 +403,14 @@ class LLMClient:
         """Reset the failed clients list (useful for recovery)."""
         self.failed_clients.clear()
         logging.info("Reset all failed client statuses.")
+
+
+async def invoke_llm_batch(llm_client, prompts: List[str]) -> List[str]:
+    """Send ``prompts`` through ``llm_client``, responses in order.
+
+    Uses the client's ``invoke_batch`` when it has one, else fans out ``invoke``.
+    """
+    invoke_batch = getattr(llm_client, "invoke_batch", None)
+    if invoke_batch is not None:
+        return await invoke_batch(prompts)
+    return list(await asyncio.gather(*(llm_client.invoke(p) for p in prompts)))
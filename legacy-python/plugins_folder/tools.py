@@ -4,6 +4,7 @@ import asyncio
 import os
 import json
 from utils.error_handlers import ErrorCode, safe_execute, ToolErrorHandler
+from llm_connector import invoke_llm_batch
 import logging
 
 logger = logging.getLogger(__name__)
@@ -579,53 +580,122 @@ class TreeOfThoughtTool(AsyncTool):
         
         try:
             # Generate initial thoughts
-            generation_prompt = f"Given this problem: '{prompt}', generate {branches} distinct approaches or thoughts as a JSON array of strings."
-            response = await self.llm_client.invoke(generation_prompt)
-            
-            try:
-                initial_thoughts = json.loads(response)
-                if not isinstance(initial_thoughts, list):
-                    initial_thoughts = [str(initial_thoughts)]
-            except json.JSONDecodeError:
-                # Fallback if JSON parsing fails
-                initial_thoughts = [f"Approach 1: {response[:100]}...", 
-                                  f"Approach 2: Alternative method", 
-                                  f"Approach 3: Creative solution"]
-            
+            response = await self.llm_client.invoke(self._generation_prompt(prompt, branches))
+            initial_thoughts = self._parse_thoughts(response)
+
             # Evaluate thoughts
             evaluated_thoughts = []
             for i, thought in enumerate(initial_thoughts[:branches]):
-                eval_prompt = f"Rate this thought/approach on a scale of 0-1 for solving '{prompt}': '{thought}'. Respond with just a number between 0 and 1."
-                try:
-                    score_response = await self.llm_client.invoke(eval_prompt)
-                    score = float(score_response.strip())
-                    if not (0 <= score <= 1):
-                        score = 0.5  # Default score if invalid
-                except (ValueError, TypeError):
-                    score = 0.5  # Default score if parsing fails
-                
+                score_response = await self.llm_client.invoke(self._evaluation_prompt(prompt, thought))
                 evaluated_thoughts.append({
                     "text": thought,
-                    "score": score,
+                    "score": self._parse_score(score_response),
                     "id": i
                 })
-            
-            # Sort by score and select best
-            evaluated_thoughts.sort(key=lambda x: x["score"], reverse=True)
-            best_thought = evaluated_thoughts[0] if evaluated_thoughts else {"text": "No valid thoughts generated", "score": 0, "id": -1}
-            
-            return self._create_success_response({
-                "prompt": prompt,
-                "thoughts": evaluated_thoughts,
-                "best_thought": best_thought,
-                "depth_processed": 1,  # For now, only doing one level
-                "branches_generated": len(evaluated_thoughts)
-            })
+
+            return self._create_success_response(self._summarize(prompt, evaluated_thoughts))
             
         except Exception as e:
             error = ToolErrorHandler.handle_tool_error(e, self.name, kwargs)
             return error.to_dict()
 
+    @safe_execute(ErrorCode.TOOL_EXECUTION)
+    async def execute_many(self, prompts: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """Run Tree of Thought over several prompts with one batched LLM call per level.
+
+        Returns one result per prompt, in order, shaped like ``execute``'s.
+        """
+        branches = kwargs.get("branches", 3)
+
+        results: List[Optional[Dict[str, Any]]] = []
+        valid: List[int] = []
+        for index, prompt in enumerate(prompts):
+            validation_error = self.validate_input(prompt=prompt)
+            if validation_error:
+                results.append(self._create_error_response(validation_error, ErrorCode.VALIDATION_ERROR.value))
+            else:
+                results.append(None)
+                valid.append(index)
+
+        if not valid:
+            return results
+        if not self.llm_client:
+            error = self._create_error_response("LLM client not available for Tree of Thought processing", ErrorCode.LLM_CONNECTION.value)
+            return [result or error for result in results]
+
+        try:
+            # Level 1: generate thoughts for every prompt in one batch
+            responses = await invoke_llm_batch(
+                self.llm_client,
+                [self._generation_prompt(prompts[i], branches) for i in valid],
+            )
+            thoughts_per_prompt = [self._parse_thoughts(r)[:branches] for r in responses]
+
+            # Level 2: evaluate every generated thought in one batch
+            eval_prompts = [
+                self._evaluation_prompt(prompts[i], thought)
+                for i, thoughts in zip(valid, thoughts_per_prompt, strict=True)
+                for thought in thoughts
+            ]
+            scores = iter(await invoke_llm_batch(self.llm_client, eval_prompts))
+
+            for i, thoughts in zip(valid, thoughts_per_prompt, strict=True):
+                evaluated_thoughts = [
+                    {"text": thought, "score": self._parse_score(next(scores)), "id": j}
+                    for j, thought in enumerate(thoughts)
+                ]
+                results[i] = self._create_success_response(self._summarize(prompts[i], evaluated_thoughts))
+            return results
+
+        except Exception as e:
+            error = ToolErrorHandler.handle_tool_error(e, self.name, kwargs).to_dict()
+            return [result or error for result in results]
+
+    @staticmethod
+    def _generation_prompt(prompt: str, branches: int) -> str:
+        # Instructions first, problem last: sibling prompts share a cacheable prefix
+        return f"Generate {branches} distinct approaches or thoughts for the problem below as a JSON array of strings.\n\nProblem: {prompt}"
+
+    @staticmethod
+    def _evaluation_prompt(prompt: str, thought: Any) -> str:
+        return f"Rate the approach below on a scale of 0-1 for solving the problem. Respond with just a number between 0 and 1.\n\nProblem: {prompt}\nApproach: {thought}"
+
+    @staticmethod
+    def _parse_thoughts(response: str) -> List[Any]:
+        try:
+            thoughts = json.loads(response)
+            if not isinstance(thoughts, list):
+                thoughts = [str(thoughts)]
+            return thoughts
+        except json.JSONDecodeError:
+            # Fallback if JSON parsing fails
+            return [f"Approach 1: {response[:100]}...",
+                    f"Approach 2: Alternative method",
+                    f"Approach 3: Creative solution"]
+
+    @staticmethod
+    def _parse_score(score_response: str) -> float:
+        try:
+            score = float(score_response.strip())
+            if not (0 <= score <= 1):
+                score = 0.5  # Default score if invalid
+        except (ValueError, TypeError):
+            score = 0.5  # Default score if parsing fails
+        return score
+
+    @staticmethod
+    def _summarize(prompt: str, evaluated_thoughts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # Sort by score and select best
+        evaluated_thoughts.sort(key=lambda x: x["score"], reverse=True)
+        best_thought = evaluated_thoughts[0] if evaluated_thoughts else {"text": "No valid thoughts generated", "score": 0, "id": -1}
+        return {
+            "prompt": prompt,
+            "thoughts": evaluated_thoughts,
+            "best_thought": best_thought,
+            "depth_processed": 1,  # For now, only doing one level
+            "branches_generated": len(evaluated_thoughts)
+        }
+
 
 class WriteToSharedStateTool(Tool):
     """A tool for writing to shared state."""
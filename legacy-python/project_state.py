@@ -17,6 +17,13 @@ class ProjectState:
         async with self._lock:
             self._state[key] = value
 
+    async def update_state_many(self, items: dict):
+        """
+        Updates the state with several key-value pairs under a single lock acquisition.
+        """
+        async with self._lock:
+            self._state.update(items)
+
     def get_state(self, key: str) -> any:
         """
         Retrieves a value from the state by key.
@@ -57,6 +57,21 @@ SEARCH_NODES_CONTAINS_TEXT = """
     LIMIT 5
     """
 
+# Batched form of SEARCH_NODES_CONTAINS_TEXT: one round trip for every query
+# in $queries, with the LIMIT applied per query and rows tagged by its index.
+SEARCH_NODES_CONTAINS_TEXT_BATCH = """
+    UNWIND range(0, size($queries) - 1) AS idx
+    CALL {
+        WITH idx
+        MATCH (n)
+        WHERE toLower(n.text) CONTAINS toLower($queries[idx])
+        OPTIONAL MATCH (n)-[r]-(m)
+        RETURN n.text AS text, COLLECT({relationship: type(r), related_text: m.text}) AS related_info
+        LIMIT $limit
+    }
+    RETURN idx, text, related_info
+    """
+
 
 AGENT_MERGE = "MERGE (a:Agent {id: $agent_id})"
 AGENTLOG_MERGE = "MERGE (l:AgentLog {id: $log_id, agent_id: $agent_id})"
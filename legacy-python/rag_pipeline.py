@@ -1,5 +1,5 @@
 import logging
-import threading
+from concurrent.futures import Future
 from typing import Any, Dict, Optional
 
 # Import database connection functions from db_connectors
@@ -24,9 +24,9 @@ def run_rag_async(
     query: str,
     context: Optional[Dict[str, Any]] = None,
     callback: Optional[Any] = None,
-) -> threading.Thread:
+) -> Future:
     """
-    Run RAG pipeline in a background thread.
+    Run RAG pipeline on the shared background event loop.
     """
     return run_async_in_thread(
         rag_orchestrator.generate_response, query, context=context, callback=callback
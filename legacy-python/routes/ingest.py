@@ -8,7 +8,8 @@ from fastapi.responses import JSONResponse
 from db_connectors import get_sql_server_connection
 from query_utils import insert_document
 from security import get_api_key
-from utils import allowed_file, extract_text
+from utils import allowed_file, extract_text_async
+from utils.error_handlers import find_error_message
 
 ingest_router = APIRouter(dependencies=[Depends(get_api_key)])
 
@@ -25,7 +26,7 @@ async def ingest_document(file: UploadFile = File(...)):  # noqa: B008
     async with aiofiles.open(save_path, "wb") as f:
         await f.write(await file.read())
     try:
-        text_content = extract_text(save_path, file_extension)
+        text_content = await extract_text_async(save_path, file_extension)
         if text_content is None:
             raise Exception("Failed to extract text from file.")
         conn_manager = get_sql_server_connection()
@@ -59,17 +60,6 @@ async def ingest_document(file: UploadFile = File(...)):  # noqa: B008
             content={"message": "Document ingested successfully."}, status_code=200
         )
     except Exception as e:
-
-        def find_error_message(exc, target):
-            while exc:
-                msg = str(exc)
-                if target in msg:
-                    return True
-                exc = getattr(exc, "__cause__", None) or getattr(
-                    exc, "__context__", None
-                )
-            return False
-
         if find_error_message(e, "Failed to extract text from file."):
             return JSONResponse(
                 content={"error": "Failed to extract text from file."}, status_code=500
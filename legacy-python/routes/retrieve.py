@@ -7,6 +7,7 @@ from db_connectors import get_milvus_client
 from security import get_api_key
 from services.embedding_service import EmbeddingService  # New import
 from services.database_search import search_milvus  # New import
+from utils.error_handlers import find_error_message
 
 logger = logging.getLogger(__name__)
 
@@ -50,17 +51,6 @@ async def retrieve(request: Request):
         return JSONResponse({"results": results}, status_code=200)
     except Exception as e:
         logger.error("Retrieve endpoint error: %s", e, exc_info=True)
-
-        def find_error_message(exc, target):
-            while exc:
-                msg = str(exc)
-                if target in msg:
-                    return True
-                exc = getattr(exc, "__cause__", None) or getattr(
-                    exc, "__context__", None
-                )
-            return False
-
         if find_error_message(e, "Failed to generate query embedding."):
             return JSONResponse(
                 {"error": "Failed to generate query embedding."}, status_code=500
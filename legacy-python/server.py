@@ -19,6 +19,8 @@ from routes.retrieve import retrieve_router
 from routes.status import status_router
 from security import get_api_key
 from config import MILVUS_HOST, MILVUS_PORT, NEO4J_URI, SQL_SERVER_SERVER
+from db_connectors import close_shared_connections
+from utils import shutdown_pdf_executor
 
 
 @asynccontextmanager
@@ -29,6 +31,8 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logging.info("🛑 HART-MCP shutting down...")
+    await close_shared_connections()
+    await shutdown_pdf_executor()
 
 
 app = FastAPI(
@@ -1,15 +1,34 @@
 import asyncio
 import logging
 import traceback
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# Max number of distinct query texts whose embeddings are kept in memory.
+EMBEDDING_CACHE_SIZE = 1024
+# Seconds a get_embedding call waits for others to join its batch, used only
+# while another encode() is already running; otherwise it dispatches at once.
+EMBEDDING_BATCH_WINDOW = 0.005
+EMBEDDING_MAX_BATCH_SIZE = 64
+
 
 class EmbeddingService:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_size: int = EMBEDDING_CACHE_SIZE,
+        batch_window: float = EMBEDDING_BATCH_WINDOW,
+        max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+    ):
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+        self._pending: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self._encodes_in_flight = 0
         try:
             self.embedding_model = SentenceTransformer(
                 "sentence-transformers/all-MiniLM-L6-v2"
@@ -33,19 +52,75 @@ class EmbeddingService:
             self.embedding_model = None
 
     async def get_embedding(self, text: str) -> Optional[List[float]]:
-        """Generate embedding for a given text."""
-        if self.embedding_model:
-            try:
-                return (
-                    await asyncio.to_thread(self.embedding_model.encode, text)
-                ).tolist()
-            except (RuntimeError, ValueError, TypeError) as e:
-                logger.error(
-                    (
-                        "Failed to generate embedding: %s\n%s",
-                        e,
-                        traceback.format_exc(),
-                    )
-                )
-                return None
-        return None
+        """Generate embedding for a given text.
+
+        Repeat queries are served from an LRU cache; concurrent misses are
+        coalesced into a single batched ``encode`` call. A miss with no encode
+        running is dispatched on the next loop turn, so a lone query does not
+        pay the batch window.
+        """
+        if not self.embedding_model:
+            return None
+
+        key = " ".join(text.split())
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return list(cached)
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            future = pending[1]
+        else:
+            future = asyncio.get_running_loop().create_future()
+            is_leader = not self._pending
+            self._pending[key] = (text, future)
+            # Both flushes are shielded: a caller cancelled mid-encode must
+            # not strand the other futures in the batch it is encoding.
+            if len(self._pending) >= self._max_batch_size:
+                await asyncio.shield(self._encode_batch(self._take_pending()))
+            elif is_leader:
+                await asyncio.shield(self._flush_after_window())
+
+        embedding = await asyncio.shield(future)
+        return list(embedding) if embedding is not None else None
+
+    def _take_pending(self) -> Dict[str, Tuple[str, asyncio.Future]]:
+        batch, self._pending = self._pending, {}
+        return batch
+
+    async def _flush_after_window(self) -> None:
+        # One loop turn lets callers scheduled alongside this one join the
+        # batch; the window is only held while the model is already busy.
+        await asyncio.sleep(self._batch_window if self._encodes_in_flight else 0)
+        await self._encode_batch(self._take_pending())
+
+    async def _encode_batch(self, batch: Dict[str, Tuple[str, asyncio.Future]]) -> None:
+        """Encode all pending texts in one call and resolve their futures."""
+        if not batch:
+            return
+        texts = [text for text, _ in batch.values()]
+        self._encodes_in_flight += 1
+        try:
+            vectors = await asyncio.to_thread(self.embedding_model.encode, texts)
+        except (RuntimeError, ValueError, TypeError) as e:
+            logger.error(
+                "Failed to generate embedding: %s\n%s", e, traceback.format_exc()
+            )
+            vectors = None
+        except Exception as e:
+            for _, future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._encodes_in_flight -= 1
+
+        for index, (key, (_, future)) in enumerate(batch.items()):
+            embedding = vectors[index].tolist() if vectors is not None else None
+            if embedding is not None and self._cache_size > 0:
+                self._cache[key] = embedding
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            if not future.done():
+                future.set_result(embedding)
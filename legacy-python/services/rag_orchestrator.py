@@ -1,8 +1,12 @@
+import copy
 import logging
 import os
+import time
 import traceback
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
+from config import CACHE_TTL, ENABLE_CACHING
 from llm_connector import LLMClient
 from plugins import call_plugin
 from services.embedding_service import EmbeddingService
@@ -11,6 +15,18 @@ from utils.error_handlers import ErrorCode, safe_execute, StandardizedError
 
 logger = logging.getLogger(__name__)
 
+# Max number of distinct queries whose final responses are kept in memory.
+ANSWER_CACHE_SIZE = 256
+
+
+def _normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace for cache lookups.
+
+    Punctuation is kept: "2+2" and "2-2", or "x > 5" and "x < 5", are
+    different questions.
+    """
+    return " ".join(query.lower().split())
+
 
 class RAGOrchestrator:
     """Enhanced RAG orchestrator with unified database service and better error handling."""
@@ -23,6 +39,7 @@ class RAGOrchestrator:
         self.llm_client = llm_client
         self.unified_db_service = unified_db_service or EnhancedUnifiedSearchService()
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.answer_cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
     @safe_execute(ErrorCode.GENERIC_ERROR)
     async def generate_response(
@@ -38,6 +55,20 @@ class RAGOrchestrator:
         if not query or not isinstance(query, str):
             return self._create_error_response("Query parameter is required and must be a string")
         
+        cache_key = None
+        if ENABLE_CACHING and context is None:
+            cache_key = (
+                _normalize_query(query), include_vector, include_graph, include_relational, limit
+            )
+            cached = self._get_cached_answer(cache_key)
+            if cached is not None:
+                self._logger.info(f"Serving cached RAG response for query: {query[:100]}...")
+                # Hits skip search and the LLM, but plugins still see every query
+                cached["plugin_results"] = await self._call_plugins(
+                    query, context, cached["search_results"], cached["final_response"]
+                )
+                return cached
+
         self._logger.info(f"Generating RAG response for query: {query[:100]}...")
         
         try:
@@ -75,14 +106,16 @@ class RAGOrchestrator:
             combined_context = self._combine_enhanced_context(search_results)
 
             # Generate LLM response
-            final_response_text = await self._generate_llm_response(query, combined_context)
+            final_response_text, generated = await self._generate_llm_response(
+                query, combined_context
+            )
 
             # Call plugins/hooks
             plugin_results = await self._call_plugins(
                 query, context, search_results, final_response_text
             )
 
-            return {
+            response = {
                 "final_response": final_response_text,
                 "search_results": search_results,
                 "context_used": combined_context,
@@ -91,11 +124,34 @@ class RAGOrchestrator:
                 "query": query,
                 "services_used": search_results.get("services_attempted", [])
             }
+            # Fallback text (LLM down or failing) must not outlive the outage
+            if cache_key is not None and generated:
+                self._store_answer(cache_key, response)
+            return response
             
         except Exception as e:
             self._logger.error(f"Error in RAG generation: {e}", exc_info=True)
             return self._create_error_response(f"RAG generation failed: {str(e)}")
     
+    def _get_cached_answer(self, cache_key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a deep copy of a cached, unexpired response for the key, if any."""
+        entry = self.answer_cache.get(cache_key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > CACHE_TTL:
+            del self.answer_cache[cache_key]
+            return None
+        self.answer_cache.move_to_end(cache_key)
+        return copy.deepcopy(response)
+
+    def _store_answer(self, cache_key: Tuple, response: Dict[str, Any]) -> None:
+        """Cache a deep copy of a successful response, evicting the least recently used entry."""
+        self.answer_cache[cache_key] = (time.monotonic(), copy.deepcopy(response))
+        self.answer_cache.move_to_end(cache_key)
+        if len(self.answer_cache) > ANSWER_CACHE_SIZE:
+            self.answer_cache.popitem(last=False)
+
     def _create_error_response(self, message: str) -> Dict[str, Any]:
         """Create standardized error response."""
         return {
@@ -202,14 +258,19 @@ class RAGOrchestrator:
     @safe_execute(ErrorCode.LLM_RESPONSE)
     async def _generate_llm_response(
         self, query: str, combined_context: List[Dict[str, Any]]
-    ) -> str:
-        """Generate LLM response with enhanced context handling."""
+    ) -> Tuple[str, bool]:
+        """Generate LLM response with enhanced context handling.
+
+        Returns ``(text, generated)``; ``generated`` is False when ``text`` is
+        a fallback or error message because no LLM is configured or the call
+        failed.
+        """
         if not self.llm_client:
             context_text = self._format_context_for_display(combined_context)
             return (
                 f"LLM not available. Based on retrieved context:\n\n{context_text}\n\n"
                 f"This information relates to your query: {query}"
-            )
+            ), False
         
         try:
             # Format context with source attribution
@@ -238,9 +299,10 @@ class RAGOrchestrator:
                 if not response:
                     response = "I was unable to generate a response based on the provided context."
                     
-                return response
+                # LLMClient reports failures as "Error..." strings rather than raising
+                return response, not generated_text.startswith("Error")
             else:
-                return str(generated_text)
+                return str(generated_text), True
                 
         except Exception as e:
             self._logger.error(f"LLM text generation failed: {e}", exc_info=True)
@@ -249,7 +311,7 @@ class RAGOrchestrator:
                 f"Error generating LLM response: {str(e)}\n\n"
                 f"Retrieved context:\n{context_text}\n\n"
                 f"Regarding your query: {query}"
-            )
+            ), False
     
     def _format_context_for_llm(self, context: List[Dict[str, Any]]) -> str:
         """Format context for LLM consumption with source attribution."""
@@ -0,0 +1,224 @@
+"""Semantic response cache for LLM prompts."""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import CACHE_TTL
+from llm_connector import invoke_llm_batch
+
+logger = logging.getLogger(__name__)
+
+# Cosine similarity above which two prompts are treated as the same request.
+SEMANTIC_CACHE_THRESHOLD = 0.87
+SEMANTIC_CACHE_SIZE = 2048
+# Rows a scope's vector matrix starts with; it doubles as prompts are stored.
+_SCOPE_MATRIX_INITIAL_ROWS = 16
+
+
+class _ScopeMatrix:
+    """Unit vectors of one scope's cached prompts, kept current on every store.
+
+    Rows live in a float32 buffer that doubles when full; a removed row is
+    filled by the last one, so neither a store nor an eviction restacks.
+    """
+
+    def __init__(self, dim: int):
+        self.keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.matrix = np.zeros((_SCOPE_MATRIX_INITIAL_ROWS, dim), dtype=np.float32)
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        if vector.shape[0] != self.matrix.shape[1]:
+            return
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self.keys)
+            if row == self.matrix.shape[0]:
+                grown = np.zeros((2 * row, self.matrix.shape[1]), dtype=np.float32)
+                grown[:row] = self.matrix
+                self.matrix = grown
+            self.keys.append(key)
+            self._rows[key] = row
+        self.matrix[row] = vector
+
+    def remove(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self.keys) - 1
+        if row != last:
+            moved = self.keys[last]
+            self.keys[row] = moved
+            self._rows[moved] = row
+            self.matrix[row] = self.matrix[last]
+        self.keys.pop()
+
+    def nearest(self, vector: np.ndarray, threshold: float) -> Optional[str]:
+        if not self.keys or vector.shape[0] != self.matrix.shape[1]:
+            return None
+        similarities = self.matrix[: len(self.keys)] @ vector
+        best = int(np.argmax(similarities))
+        return self.keys[best] if similarities[best] >= threshold else None
+
+
+class SemanticCache:
+    """LRU cache of LLM responses keyed by prompt, with a semantic fallback.
+
+    Lookups first try an exact prompt match. On a miss, and when an embedding
+    function is configured, the prompt is embedded and compared against the
+    cached prompts by cosine similarity; the best match at or above
+    ``threshold`` is returned. Entries older than ``ttl`` seconds are dropped
+    when a lookup reaches them.
+
+    ``scope_fn`` splits a prompt into ``(scope, text)``: only ``text`` is
+    embedded and semantic matches never cross scopes. Templated prompts use it
+    so a long shared instruction block does not make every prompt look alike.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Optional[Callable[[str], Awaitable[Optional[List[float]]]]] = None,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_SIZE,
+        scope_fn: Optional[Callable[[str], Tuple[str, str]]] = None,
+        ttl: float = CACHE_TTL,
+    ):
+        self._embed_fn = embed_fn
+        self._scope_fn = scope_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # prompt -> (scope, vector, response, monotonic time stored)
+        self._entries: "OrderedDict[str, Tuple[str, Optional[np.ndarray], str, float]]" = (
+            OrderedDict()
+        )
+        # scope -> vectors of that scope's cached prompts
+        self._matrices: Dict[str, _ScopeMatrix] = {}
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def lookup(self, prompt: str) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """Return ``(cached_response, prompt_vector)``; the response is None on a miss.
+
+        The vector is returned so a following ``store`` need not re-embed.
+        """
+        entry = self._fresh_entry(prompt)
+        if entry is not None:
+            self._entries.move_to_end(prompt)
+            self.hits += 1
+            return entry[2], entry[1]
+
+        scope, text = self._split(prompt)
+        vector = await self._embed(text)
+        if vector is not None:
+            # Expired matches are dropped, so retry until a fresh one or none
+            while (match := self._nearest(scope, vector)) is not None:
+                entry = self._fresh_entry(match)
+                if entry is not None:
+                    self._entries.move_to_end(match)
+                    self.semantic_hits += 1
+                    return entry[2], vector
+
+        self.misses += 1
+        return None, vector
+
+    def store(self, prompt: str, vector: Optional[np.ndarray], response: str) -> None:
+        """Cache a response; LLM error strings are not cached."""
+        if not isinstance(response, str) or response.startswith("Error"):
+            return
+        scope = self._split(prompt)[0]
+        self._entries[prompt] = (scope, vector, response, time.monotonic())
+        self._entries.move_to_end(prompt)
+        if vector is not None:
+            matrix = self._matrices.get(scope)
+            if matrix is None:
+                matrix = self._matrices[scope] = _ScopeMatrix(vector.shape[0])
+            matrix.put(prompt, vector)
+        else:
+            self._unindex(scope, prompt)
+        if len(self._entries) > self.max_entries:
+            evicted, (evicted_scope, _, _, _) = self._entries.popitem(last=False)
+            self._unindex(evicted_scope, evicted)
+
+    def _fresh_entry(self, prompt: str):
+        """The entry cached for ``prompt``, or None; an expired entry is removed."""
+        entry = self._entries.get(prompt)
+        if entry is not None and time.monotonic() - entry[3] > self.ttl:
+            del self._entries[prompt]
+            self._unindex(entry[0], prompt)
+            return None
+        return entry
+
+    def _unindex(self, scope: str, prompt: str) -> None:
+        matrix = self._matrices.get(scope)
+        if matrix is not None:
+            matrix.remove(prompt)
+            if not matrix.keys:
+                del self._matrices[scope]
+
+    def _split(self, prompt: str) -> Tuple[str, str]:
+        return self._scope_fn(prompt) if self._scope_fn else ("", prompt)
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        if self._embed_fn is None:
+            return None
+        try:
+            embedding = await self._embed_fn(text)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+        if embedding is None:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _nearest(self, scope: str, vector: np.ndarray) -> Optional[str]:
+        """Key of the most similar cached prompt in ``scope`` at or above the threshold."""
+        matrix = self._matrices.get(scope)
+        return matrix.nearest(vector, self.threshold) if matrix is not None else None
+
+
+class CachedLLMClient:
+    """Wraps an LLM client so default-parameter calls go through a ``SemanticCache``.
+
+    Calls that set ``temperature`` or ``max_tokens`` explicitly bypass the cache.
+    """
+
+    def __init__(self, llm_client, cache: SemanticCache):
+        self.llm_client = llm_client
+        self.cache = cache
+
+    async def invoke(
+        self, prompt: str, temperature: float = None, max_tokens: int = None
+    ) -> str:
+        if temperature is not None or max_tokens is not None:
+            return await self.llm_client.invoke(prompt, temperature, max_tokens)
+        cached, vector = await self.cache.lookup(prompt)
+        if cached is not None:
+            return cached
+        response = await self.llm_client.invoke(prompt)
+        self.cache.store(prompt, vector, response)
+        return response
+
+    async def invoke_batch(self, prompts: List[str]) -> List[str]:
+        """Serve cached prompts and send only the misses upstream, in one batch."""
+        # Concurrent, so the prompts' embeddings are coalesced into one encode
+        lookups = await asyncio.gather(*(self.cache.lookup(prompt) for prompt in prompts))
+        results = [cached for cached, _ in lookups]
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        if misses:
+            miss_prompts = [prompts[i] for i in misses]
+            responses = await invoke_llm_batch(self.llm_client, miss_prompts)
+            for i, response in zip(misses, responses, strict=True):
+                self.cache.store(prompts[i], lookups[i][1], response)
+                results[i] = response
+        return results
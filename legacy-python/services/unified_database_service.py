@@ -1,19 +1,66 @@
 """Unified database service implementation."""
 import asyncio
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
 from utils.database_interfaces import (
+    CachedVectorSearchService,
+    Embedding,
+    as_query_vector,
+    canonical_filter_key,
     VectorSearchService, 
     GraphSearchService, 
     RelationalSearchService,
     UnifiedSearchService
 )
 from utils.error_handlers import ErrorCode, DatabaseErrorHandler, safe_execute
-from config import MILVUS_COLLECTION
+from config import (
+    ENABLE_CACHING,
+    MILVUS_COLLECTION,
+    VECTOR_SEARCH_CACHE_SIZE,
+    VECTOR_SEARCH_CACHE_TTL,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# Value types a Milvus filter can compare a field against.
+_MILVUS_FILTER_SCALARS = (str, bool, int, float)
+
+
+def _milvus_filter(filters: Optional[Dict[str, Any]]) -> str:
+    """Milvus boolean expression for ``filters``: equality for scalars, ``in`` for lists.
+
+    Raises ValueError on a field name that is not an identifier or a value
+    with no flat Milvus form, so a query never runs with part of its filter
+    silently dropped. A ``None`` value means "no filter on this field".
+    """
+    for field, value in (filters or {}).items():
+        if not isinstance(field, str) or not field.isidentifier():
+            raise ValueError(f"Invalid Milvus filter field: {field!r}")
+        if value is None or isinstance(value, _MILVUS_FILTER_SCALARS):
+            continue
+        if isinstance(value, (list, tuple)) and all(
+            isinstance(item, _MILVUS_FILTER_SCALARS) for item in value
+        ):
+            continue
+        raise ValueError(f"Unsupported Milvus filter value for {field!r}: {value!r}")
+    return _milvus_filter_expression(canonical_filter_key(filters))
+
+
+@lru_cache(maxsize=256)
+def _milvus_filter_expression(filter_key: tuple) -> str:
+    """Expression for an already validated canonical filter key, built once per key."""
+    clauses = []
+    for field, value in filter_key:
+        if isinstance(value, tuple):
+            clauses.append(f"{field} in {json.dumps(list(value))}")
+        elif value is not None:
+            clauses.append(f"{field} == {json.dumps(value)}")
+    return " and ".join(clauses)
+
+
 class MilvusSearchService(VectorSearchService):
     """Concrete implementation of vector search using Milvus."""
     
@@ -34,7 +81,7 @@ class MilvusSearchService(VectorSearchService):
             return False
     
     async def disconnect(self) -> None:
-        """Close Milvus connection."""
+        """Release the shared Milvus client; it stays open for other callers."""
         self._client = None
         
     async def is_healthy(self) -> bool:
@@ -42,61 +89,91 @@ class MilvusSearchService(VectorSearchService):
         try:
             from utils import milvus_connection_context
             async with milvus_connection_context() as client:
-                return client is not None
+                if client is None:
+                    return False
+                # The shared client outlives outages, so ping the server
+                await asyncio.to_thread(client.get_server_version)
+                return True
         except Exception:
             return False
     
     @safe_execute(ErrorCode.DATABASE_QUERY)
     async def search_by_vector(self, 
-                              embedding: List[float], 
+                              embedding: Embedding, 
                               collection: str = None,
                               limit: int = 5,
                               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Search for similar vectors in Milvus."""
-        if not collection:
-            collection = MILVUS_COLLECTION
-            
+        """Search for similar vectors in Milvus.
+
+        ``embedding`` may be a list or a float32 numpy array; it is handed to
+        pymilvus as-is, so arrays skip per-element float boxing.
+        """
         try:
-            from utils import milvus_connection_context
-            async with milvus_connection_context() as milvus_client:
-                if not milvus_client:
-                    raise ConnectionError("Milvus client not available")
-                
-                search_params = {"metric_type": "COSINE", "params": {"nprobe": 10}}
-                
-                # Apply filters if provided
-                if filters:
-                    # Milvus filter implementation would go here
-                    pass
-                
-                milvus_results = await asyncio.to_thread(
-                    milvus_client.search,
-                    collection_name=collection,
-                    data=[embedding],
-                    anns_field="embedding",
-                    search_params=search_params,
-                    limit=limit,
-                    output_fields=["document_id", "text"]
-                )
-                
-                # Extract and format results
-                extracted_results = []
-                for hits_list in milvus_results:
-                    for hit in hits_list:
-                        extracted_results.append({
-                            "id": hit.id,
-                            "distance": hit.distance,
-                            "score": 1 - hit.distance,  # Convert distance to similarity score
-                            "document_id": hit.entity.get("document_id"),
-                            "text": hit.entity.get("text"),
-                            "source": "milvus"
-                        })
-                
-                return extracted_results
-                
+            return (await self._search([embedding], collection, limit, filters))[0]
         except Exception as e:
             error = DatabaseErrorHandler.handle_query_error(e, f"vector search with {len(embedding)} dims", "Milvus")
             raise Exception(error.message) from e
+
+    @safe_execute(ErrorCode.DATABASE_QUERY)
+    async def search_by_vectors(self,
+                               embeddings: Sequence[Embedding],
+                               collection: str = None,
+                               limit: int = 5,
+                               filters: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """Search several vectors in one Milvus request; one result list per embedding."""
+        if not len(embeddings):
+            return []
+        try:
+            return await self._search(list(embeddings), collection, limit, filters)
+        except Exception as e:
+            error = DatabaseErrorHandler.handle_query_error(
+                e, f"batched vector search of {len(embeddings)} queries", "Milvus"
+            )
+            raise Exception(error.message) from e
+
+    async def _search(self,
+                      embeddings: List[Embedding],
+                      collection: Optional[str],
+                      limit: int,
+                      filters: Optional[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Run one Milvus search request and format the hits per query vector."""
+        if not collection:
+            collection = MILVUS_COLLECTION
+        expression = _milvus_filter(filters)
+            
+        from utils import milvus_connection_context
+        async with milvus_connection_context() as milvus_client:
+            if not milvus_client:
+                raise ConnectionError("Milvus client not available")
+            
+            search_params = {"metric_type": "COSINE", "params": {"nprobe": 10}}
+            
+            milvus_results = await asyncio.to_thread(
+                milvus_client.search,
+                collection_name=collection,
+                data=embeddings,
+                filter=expression,
+                anns_field="embedding",
+                search_params=search_params,
+                limit=limit,
+                output_fields=["document_id", "text"]
+            )
+            
+            # Extract and format results, one list per query vector
+            return [
+                [
+                    {
+                        "id": hit.id,
+                        "distance": hit.distance,
+                        "score": 1 - hit.distance,  # Convert distance to similarity score
+                        "document_id": hit.entity.get("document_id"),
+                        "text": hit.entity.get("text"),
+                        "source": "milvus"
+                    }
+                    for hit in hits_list
+                ]
+                for hits_list in milvus_results
+            ]
     
     @safe_execute(ErrorCode.DATABASE_QUERY)
     async def insert_vectors(self, collection: str, vectors: List[Dict[str, Any]]) -> bool:
@@ -144,17 +221,18 @@ class Neo4jSearchService(GraphSearchService):
             return False
     
     async def disconnect(self) -> None:
-        """Close Neo4j connection."""
-        if self._driver:
-            await self._driver.close()
-            self._driver = None
+        """Release the shared Neo4j driver; it stays open for other callers."""
+        self._driver = None
     
     async def is_healthy(self) -> bool:
         """Check if Neo4j connection is healthy."""
         try:
             from utils import neo4j_connection_context
             async with neo4j_connection_context() as driver:
-                return driver is not None
+                if driver is None:
+                    return False
+                await driver.verify_connectivity()
+                return True
         except Exception:
             return False
     
@@ -195,34 +273,63 @@ class Neo4jSearchService(GraphSearchService):
                         cypher_query += f" LIMIT {limit}"
                     
                     result = await session.run(cypher_query, params)
-                    records = await result.data()
-                    
-                    formatted_results = []
-                    for i, record in enumerate(records):
-                        node_text = record.get("text", "")
-                        related_info = record.get("related_info", [])
-                        
-                        result_entry = {
-                            "id": i,
-                            "text": node_text,
-                            "source": "neo4j",
-                            "relationships": []
-                        }
-                        
-                        if related_info:
-                            for rel in related_info:
-                                result_entry["relationships"].append({
-                                    "type": rel.get("relationship", ""),
-                                    "related_text": rel.get("related_text", "")
-                                })
-                        
-                        formatted_results.append(result_entry)
-                    
-                    return formatted_results
+                    return self._format_records(await result.data())
                     
         except Exception as e:
             error = DatabaseErrorHandler.handle_query_error(e, query[:50], "Neo4j")
             raise Exception(error.message) from e
+
+    @safe_execute(ErrorCode.DATABASE_QUERY)
+    async def search_nodes_batch(self,
+                                queries: Sequence[str],
+                                limit: int = 10) -> List[List[Dict[str, Any]]]:
+        """Search several text queries in one UNWIND round trip; one list per query."""
+        if not queries:
+            return []
+        try:
+            from utils import neo4j_connection_context
+            from query_utils import SEARCH_NODES_CONTAINS_TEXT_BATCH
+
+            async with neo4j_connection_context() as neo4j_driver:
+                if not neo4j_driver:
+                    raise ConnectionError("Neo4j driver not available")
+
+                async with neo4j_driver.session() as session:
+                    result = await session.run(
+                        SEARCH_NODES_CONTAINS_TEXT_BATCH,
+                        {"queries": list(queries), "limit": limit},
+                    )
+                    records = await result.data()
+
+            grouped = [[] for _ in queries]
+            for record in records:
+                grouped[record["idx"]].append(record)
+            return [self._format_records(group) for group in grouped]
+
+        except Exception as e:
+            error = DatabaseErrorHandler.handle_query_error(
+                e, f"batched node search of {len(queries)} queries", "Neo4j"
+            )
+            raise Exception(error.message) from e
+
+    @staticmethod
+    def _format_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Shape Neo4j text-search records into search results."""
+        formatted_results = []
+        for i, record in enumerate(records):
+            result_entry = {
+                "id": i,
+                "text": record.get("text", ""),
+                "source": "neo4j",
+                "relationships": []
+            }
+            for rel in record.get("related_info") or []:
+                result_entry["relationships"].append({
+                    "type": rel.get("relationship", ""),
+                    "related_text": rel.get("related_text", "")
+                })
+            formatted_results.append(result_entry)
+        return formatted_results
     
     @safe_execute(ErrorCode.DATABASE_QUERY)
     async def create_relationship(self, 
@@ -283,14 +390,14 @@ class SQLServerSearchService(RelationalSearchService):
             return False
     
     async def disconnect(self) -> None:
-        """Close SQL Server connection."""
-        # Connection management handled by context managers
+        """Nothing to release: queries check connections out of the shared pool."""
         pass
     
     async def is_healthy(self) -> bool:
         """Check if SQL Server connection is healthy."""
         try:
-            return await self.execute_query("SELECT 1 as health_check") is not None
+            # execute_query reports failures as an error dict, not an exception
+            return isinstance(await self.execute_query("SELECT 1 as health_check"), list)
         except Exception:
             return False
     
@@ -400,6 +507,10 @@ class EnhancedUnifiedSearchService(UnifiedSearchService):
     def __init__(self):
         # Initialize concrete implementations
         vector_service = MilvusSearchService()
+        if ENABLE_CACHING:
+            vector_service = CachedVectorSearchService(
+                vector_service, VECTOR_SEARCH_CACHE_SIZE, ttl=VECTOR_SEARCH_CACHE_TTL
+            )
         graph_service = Neo4jSearchService()  
         relational_service = SQLServerSearchService()
         
@@ -411,7 +522,7 @@ class EnhancedUnifiedSearchService(UnifiedSearchService):
     })
     async def search_all(self, 
                         query: str, 
-                        embedding: Optional[List[float]] = None,
+                        embedding: Optional[Embedding] = None,
                         limit: int = 5,
                         include_vector: bool = True,
                         include_graph: bool = True,
@@ -427,65 +538,34 @@ class EnhancedUnifiedSearchService(UnifiedSearchService):
             "services_attempted": []
         }
         
-        successful_searches = 0
-        
-        # Vector search
-        if include_vector and self.vector_service and embedding:
-            results["services_attempted"].append("vector")
-            try:
-                if await self.vector_service.is_healthy():
-                    vector_results = await self.vector_service.search_by_vector(
-                        embedding, limit=limit
-                    )
-                    results["vector_results"] = vector_results
-                    if vector_results:
-                        successful_searches += 1
-                        self._logger.info(f"Vector search returned {len(vector_results)} results")
-                else:
-                    results["errors"].append("Vector service unhealthy")
-            except Exception as e:
-                error = DatabaseErrorHandler.handle_connection_error(e, "vector")
-                results["errors"].append(error.to_dict())
-                self._logger.error(f"Vector search failed: {e}")
-        
-        # Graph search
+        searches = {}
+        if include_vector and self.vector_service and embedding is not None and len(embedding):
+            # Converted once here; the cache and pymilvus reuse the same buffer
+            searches["vector"] = self.vector_service.search_by_vector(
+                as_query_vector(embedding), limit=limit
+            )
         if include_graph and self.graph_service:
-            results["services_attempted"].append("graph")
-            try:
-                if await self.graph_service.is_healthy():
-                    graph_results = await self.graph_service.search_nodes(
-                        query, limit=limit
-                    )
-                    results["graph_results"] = graph_results
-                    if graph_results:
-                        successful_searches += 1
-                        self._logger.info(f"Graph search returned {len(graph_results)} results")
-                else:
-                    results["errors"].append("Graph service unhealthy")
-            except Exception as e:
-                error = DatabaseErrorHandler.handle_connection_error(e, "graph")
-                results["errors"].append(error.to_dict())
-                self._logger.error(f"Graph search failed: {e}")
-        
+            searches["graph"] = self.graph_service.search_nodes(query, limit=limit)
         # Relational search (only if explicitly requested with specific query)
         if include_relational and self.relational_service:
-            results["services_attempted"].append("relational")
-            try:
-                # Perform text-based search across metadata tables
-                search_results = await self.relational_service.search_documents(
-                    query=query,
-                    limit=limit
-                )
-                if search_results and isinstance(search_results, list):
-                    results["relational_results"].extend(search_results)
-                    successful_searches += 1
-                    self._logger.info(f"Relational search returned {len(search_results)} results")
-                else:
-                    results["errors"].append("Relational service returned no results")
-            except Exception as e:
-                error = DatabaseErrorHandler.handle_connection_error(e, "relational")
-                results["errors"].append(error.to_dict())
-                self._logger.error(f"Relational search failed: {e}")
+            searches["relational"] = self.relational_service.search_documents(
+                query=query, limit=limit
+            )
+        results["services_attempted"] = list(searches)
+
+        # Backends are queried concurrently: latency is the slowest, not the sum
+        successful_searches = 0
+        for name, (found, error) in (await self._run_searches(searches)).items():
+            if error is not None:
+                results["errors"].append(error)
+                self._logger.error(f"{name.capitalize()} search failed: {error['message']}")
+                continue
+            results[f"{name}_results"] = found
+            if found:
+                successful_searches += 1
+                self._logger.info(f"{name.capitalize()} search returned {len(found)} results")
+            elif name == "relational":
+                results["errors"].append("Relational service returned no results")
             
         results["search_successful"] = successful_searches > 0
         results["services_succeeded"] = successful_searches
@@ -496,34 +576,27 @@ class EnhancedUnifiedSearchService(UnifiedSearchService):
     async def get_service_status(self) -> Dict[str, Dict[str, Any]]:
         """Get detailed status of all database services."""
         status = {}
-        
-        services = [
+        outcomes = await self._probe_health()
+
+        for service_name, service in (
             ("vector", self.vector_service),
-            ("graph", self.graph_service), 
-            ("relational", self.relational_service)
-        ]
-        
-        for service_name, service in services:
-            if service:
-                try:
-                    is_healthy = await service.is_healthy()
-                    status[service_name] = {
-                        "healthy": is_healthy,
-                        "name": service.name,
-                        "type": service.__class__.__name__
-                    }
-                except Exception as e:
-                    status[service_name] = {
-                        "healthy": False,
-                        "name": service.name,
-                        "error": str(e),
-                        "type": service.__class__.__name__
-                    }
-            else:
+            ("graph", self.graph_service),
+            ("relational", self.relational_service),
+        ):
+            if not service:
                 status[service_name] = {
                     "healthy": False,
                     "error": "Service not initialized"
                 }
+                continue
+            outcome = outcomes[service_name]
+            status[service_name] = {
+                "healthy": outcome is True,
+                "name": service.name,
+                "type": service.__class__.__name__
+            }
+            if isinstance(outcome, BaseException):
+                status[service_name]["error"] = str(outcome) or type(outcome).__name__
         
         return status
 
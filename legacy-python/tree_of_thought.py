@@ -2,34 +2,61 @@ import asyncio
 import json
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+from config import ENABLE_CACHING
 from db_connectors import get_sql_server_connection
-from llm_connector import LLMClient
+from llm_connector import LLMClient, invoke_llm_batch
+from services.semantic_cache import CachedLLMClient, SemanticCache
 
 
 def prune_tree(root, min_score=0):
     """Prune the tree by removing children below min_score."""
     if not hasattr(root, "children"):
         return root
-    pruned_children = [c for c in root.children if c.score >= min_score]
-    for child in pruned_children:
-        prune_tree(child, min_score)
-    root.children = pruned_children
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        pruned_children = [c for c in node.children if c.score >= min_score]
+        if len(pruned_children) != len(node.children):
+            node.children = pruned_children
+            invalidate = getattr(node, "invalidate_dict_cache", None)
+            if invalidate:
+                invalidate()
+        stack.extend(pruned_children)
     return root
 
 
 def select_best_thought(root):
-    """Select the best thought from the tree (highest score, depth-first)."""
+    """Select the best thought from the tree (highest score, depth-first).
+
+    Subtrees whose ``subtree_max`` cannot beat the best score so far are
+    skipped; the result is the same as a full walk.
+    """
     best = root
     stack = [root]
     while stack:
         node = stack.pop()
         if node.score > best.score:
             best = node
-        stack.extend(node.children)
+        stack.extend(c for c in node.children if c.subtree_max > best.score)
     return best
 
 
 class Thought:
+    # Trees can hold thousands of nodes; slots drop the per-instance __dict__.
+    __slots__ = (
+        "text", "score", "parent", "children", "log_id", "subtree_max", "_dict_cache"
+    )
+
     def __init__(
         self,
         text: str,
@@ -42,91 +69,256 @@ class Thought:
         self.parent = parent
         self.children = []
         self.log_id = log_id
+        # Upper bound on any score in this subtree; kept current by add_child,
+        # so scores should not change once a node is attached.
+        self.subtree_max = score
+        self._dict_cache = None
 
     def add_child(self, child: "Thought"):
+        child.parent = self
         self.children.append(child)
+        self.invalidate_dict_cache()
+        node = self
+        while node is not None and child.subtree_max > node.subtree_max:
+            node.subtree_max = child.subtree_max
+            node = node.parent
+
+    def invalidate_dict_cache(self):
+        """Drop the cached dict of this node and every ancestor."""
+        node = self
+        while node is not None and node._dict_cache is not None:
+            node._dict_cache = None
+            node = node.parent
 
     def to_dict(self):
-        return {
-            "text": self.text,
-            "score": self.score,
-            "children": [child.to_dict() for child in self.children],
-        }
+        """Return the subtree as a dict, reusing cached subtrees that have not changed.
+
+        The returned dict is shared with the cache; treat it as read-only.
+        """
+        if self._dict_cache is None:
+            # Collect stale nodes parents-first, then build them in reverse so
+            # each child's dict exists before its parent's; no recursion.
+            stale = []
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                stale.append(node)
+                stack.extend(c for c in node.children if c._dict_cache is None)
+            for node in reversed(stale):
+                node._dict_cache = {
+                    "text": node.text,
+                    "score": node.score,
+                    "children": [child._dict_cache for child in node.children],
+                }
+        return self._dict_cache
 
 
 logger = logging.getLogger(__name__)
 
+# OUTPUT returns the new LogID from the INSERT itself; pyodbc cursors have no
+# lastrowid, and a follow-up SCOPE_IDENTITY() query would cost a round trip.
+_INSERT_AGENT_LOG_SQL = (
+    "INSERT INTO AgentLogs (AgentID, Problem, ThoughtTree) "
+    "OUTPUT INSERTED.LogID VALUES (?, ?, ?);"
+)
+# Reusing the same SQL text on the same cursor lets pyodbc reuse the prepared statement.
+_UPDATE_THOUGHT_TREE_SQL = "UPDATE AgentLogs SET ThoughtTree = ? WHERE LogID = ?"
+
+
+def _json_dumps(obj) -> str:
+    """Serialize for the NVARCHAR ThoughtTree column, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _json_loads(text):
+    """Parse an LLM reply; orjson's JSONDecodeError subclasses json's."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+if msgspec is not None:
+
+    class _ScoreMsg(msgspec.Struct):
+        score: float = 0.0
+
+    # Lenient so a quoted number ("0.7") still parses, as float() allowed.
+    _score_decoder = msgspec.json.Decoder(_ScoreMsg, strict=False)
+
+
+def _decode_score(response_text) -> float:
+    """Parse an evaluation reply of the form ``{"score": x}``."""
+    if msgspec is None:
+        return float(_json_loads(response_text).get("score", 0.0))
+    try:
+        return _score_decoder.decode(response_text).score
+    except msgspec.DecodeError as e:
+        raise ValueError(str(e)) from e
+
+
+# Static instructions come first and the node text last, so every prompt in
+# a tree shares its template as a prefix that provider prompt caches can reuse.
+_THOUGHT_MARKER = "\n\nThought: "
+_GENERATION_PROMPT = (
+    "Generate 3 possible next thoughts that follow from the thought below and "
+    "rate each on a scale of 0 to 1, where 1 is the best. Respond with a JSON "
+    "list of objects with keys 'text' and 'score'." + _THOUGHT_MARKER
+)
+_EVALUATION_PROMPT = (
+    "Evaluate the thought below on a scale of 0 to 1, where 1 is the best. "
+    "Respond with a JSON object with a single key, 'score'." + _THOUGHT_MARKER
+)
+
+# Generation/evaluation prompts repeat across sessions; shared by every tree.
+_thought_cache = None
+# Thoughts that differ in one word can embed very close together, so only
+# near-identical thought text may share a cached response.
+_THOUGHT_CACHE_THRESHOLD = 0.98
+
+
+def _split_thought_prompt(prompt: str):
+    """Scope semantic matches to one template and embed only the thought text."""
+    template, marker, text = prompt.rpartition(_THOUGHT_MARKER)
+    return (template, text) if marker else ("", prompt)
+
+
+def _get_thought_cache() -> SemanticCache:
+    """Build the shared prompt cache on first use (loads the embedding model)."""
+    global _thought_cache
+    if _thought_cache is None:
+        from services.embedding_service import EmbeddingService
+
+        _thought_cache = SemanticCache(
+            embed_fn=EmbeddingService().get_embedding,
+            threshold=_THOUGHT_CACHE_THRESHOLD,
+            scope_fn=_split_thought_prompt,
+        )
+    return _thought_cache
+
+
+def _insert_agent_log(cursor, agent_id, initial_query):
+    """Insert the AgentLogs row and return its id (one executor hop)."""
+    cursor.execute(
+        _INSERT_AGENT_LOG_SQL,
+        agent_id,
+        initial_query,
+        _json_dumps({"root": initial_query}),
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
 
 async def update_agent_log_thought_tree(
     sql_server_conn,
     log_id: int,
-    thought_tree_json: str
+    thought_tree_json: str,
+    cursor=None,
 ):
-    """Updates the ThoughtTree JSON column in AgentLogs table."""
-    cursor = await asyncio.to_thread(sql_server_conn.cursor)
+    """Updates the ThoughtTree JSON column in AgentLogs table.
+
+    Pass an existing ``cursor`` to reuse it instead of opening a new one.
+    """
+    if cursor is None:
+        cursor = await asyncio.to_thread(sql_server_conn.cursor)
     await asyncio.to_thread(
-        cursor.execute,
-        "UPDATE AgentLogs SET ThoughtTree = ? WHERE LogID = ?",
-        thought_tree_json,
-        log_id,
+        cursor.execute, _UPDATE_THOUGHT_TREE_SQL, thought_tree_json, log_id
     )
 
-async def expand_thought_tree(thought: Thought, llm_client: LLMClient):
-    """Expands a thought by generating and evaluating child thoughts."""
-    # Generate child thoughts
-    generation_prompt = f"Given the thought \"{thought.text}\", generate 3 possible next thoughts as a JSON list of strings."
+
+def _parse_scored_thought(item):
+    """Split a generated item into ``(text, score)``; score is None if absent or invalid.
+
+    The text is always a string, whatever JSON type the model put there.
+    """
+    if not isinstance(item, dict):
+        return str(item), None
     try:
-        response_text = await llm_client.invoke(generation_prompt)
-        child_thought_texts = json.loads(response_text)
-    except (json.JSONDecodeError, TypeError) as e:
-        logger.error(f"Error decoding LLM response for thought generation: {e}")
-        return
-
-    # Evaluate child thoughts
-    for child_text in child_thought_texts:
-        evaluation_prompt = f"Evaluate the following thought on a scale of 0 to 1, where 1 is the best: \"{child_text}\". Respond with a JSON object with a single key, 'score'."
-        try:
-            response_text = await llm_client.invoke(evaluation_prompt)
-            score_data = json.loads(response_text)
-            score = float(score_data.get('score', 0.0))
-        except (json.JSONDecodeError, TypeError, ValueError) as e:
-            logger.error(f"Error decoding LLM response for thought evaluation: {e}")
-            score = 0.0
-        
-        child_thought = Thought(child_text, score=score, parent=thought, log_id=thought.log_id)
-        thought.add_child(child_thought)
-
-
-async def initiate_tree_of_thought(initial_query, agent_id, llm_client: LLMClient):
-    conn = await get_sql_server_connection()
-    if not conn:
+        score = float(item["score"])
+    except (KeyError, TypeError, ValueError):
+        score = None
+    text = item.get("text")
+    return ("" if text is None else str(text)), score
+
+
+async def expand_thought_tree(thought: Thought, llm_client: LLMClient, depth: int = 1):
+    """Expands a thought by generating and evaluating child thoughts.
+
+    The tree is grown breadth-first, one level per iteration. Each level makes
+    one batched LLM call that generates and scores the children together; a
+    second batched evaluation call is only made for children the model left
+    unscored.
+    """
+    level = [thought]
+    for _ in range(depth):
+        # Generate and score child thoughts for every node on this level
+        generation_prompts = [f"{_GENERATION_PROMPT}{node.text}" for node in level]
+        children = []
+        responses = await invoke_llm_batch(llm_client, generation_prompts)
+        for node, response_text in zip(level, responses, strict=True):
+            try:
+                generated = _json_loads(response_text)
+            except (json.JSONDecodeError, TypeError) as e:
+                logger.error(f"Error decoding LLM response for thought generation: {e}")
+                continue
+            if not isinstance(generated, list):
+                # A lone object or scalar is one thought, as in
+                # TreeOfThoughtTool._parse_thoughts
+                generated = [generated if isinstance(generated, dict) else str(generated)]
+            children.extend((node, *_parse_scored_thought(item)) for item in generated)
+
+        if not children:
+            break
+
+        # Fall back to a batched evaluation for children that came back unscored
+        unscored = [i for i, (_, _, score) in enumerate(children) if score is None]
+        if unscored:
+            evaluation_prompts = [f"{_EVALUATION_PROMPT}{children[i][1]}" for i in unscored]
+            for i, response_text in zip(
+                unscored, await invoke_llm_batch(llm_client, evaluation_prompts), strict=True
+            ):
+                try:
+                    score = _decode_score(response_text)
+                except (json.JSONDecodeError, TypeError, ValueError, AttributeError) as e:
+                    logger.error(f"Error decoding LLM response for thought evaluation: {e}")
+                    score = 0.0
+                node, child_text, _ = children[i]
+                children[i] = (node, child_text, score)
+
+        next_level = []
+        for node, child_text, score in children:
+            child_thought = Thought(child_text, score=score, parent=node, log_id=node.log_id)
+            node.add_child(child_thought)
+            next_level.append(child_thought)
+        level = next_level
+
+
+async def initiate_tree_of_thought(
+    initial_query, agent_id, llm_client: LLMClient, depth: int = 1
+):
+    connection_manager = await get_sql_server_connection()
+    if not connection_manager:
         return None
+    if ENABLE_CACHING:
+        llm_client = CachedLLMClient(llm_client, _get_thought_cache())
     try:
-        cursor = await asyncio.to_thread(conn.cursor)
-        await asyncio.to_thread(
-            cursor.execute,
-            "INSERT INTO AgentLogs (AgentID, Problem, ThoughtTree) VALUES (?, ?, ?);",
-            agent_id,
-            initial_query,
-            json.dumps({"root": initial_query}),
-        )
-        log_id = await asyncio.to_thread(getattr, cursor, "lastrowid", None)
-        root_thought = Thought(initial_query, log_id=log_id)
-        
-        await expand_thought_tree(root_thought, llm_client)
-
-        if log_id is not None:
-            await update_agent_log_thought_tree(
-                conn, log_id, json.dumps(root_thought.to_dict())
+        # Pooled checkout: the manager commits and returns the connection on
+        # success, and rolls back and discards it on error.
+        async with connection_manager as conn:
+            cursor = await asyncio.to_thread(conn.cursor)
+            log_id = await asyncio.to_thread(
+                _insert_agent_log, cursor, agent_id, initial_query
             )
-        
-        await asyncio.to_thread(conn.commit)
-        return root_thought
+            root_thought = Thought(initial_query, log_id=log_id)
+            await expand_thought_tree(root_thought, llm_client, depth=depth)
+            # Per-level writes would all hit this one row inside the same
+            # uncommitted transaction, so only the final tree is written.
+            if log_id is not None:
+                await update_agent_log_thought_tree(
+                    conn, log_id, _json_dumps(root_thought.to_dict()), cursor=cursor
+                )
+            return root_thought
     except Exception as e:
         logger.error(f"Error in initiate_tree_of_thought: {e}", exc_info=True)
-        if conn:
-            await asyncio.to_thread(conn.rollback)
         return None
-    finally:
-        if conn:
-            await asyncio.to_thread(conn.close)
@@ -1,10 +1,15 @@
 import asyncio
 import logging
+import multiprocessing
 import os
+import re
+import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 try:
     import pyodbc
@@ -19,70 +24,59 @@ from neo4j.exceptions import Neo4jError
 from PIL import Image
 from pymilvus import MilvusException
 
-from db_connectors import get_milvus_client, get_neo4j_driver, get_sql_server_connection
+from db_connectors import (
+    get_shared_milvus_client,
+    get_shared_neo4j_driver,
+    get_sql_server_connection,
+)
 
 logger = logging.getLogger(__name__)
 
 
-@asynccontextmanager  # Changed to asynccontextmanager
-async def neo4j_connection_context():  # Changed to async def
+@asynccontextmanager
+async def neo4j_connection_context():
     """
-    Asynchronous context manager for Neo4j driver.
-    Ensures the driver is properly closed.
+    Asynchronous context manager for the shared Neo4j driver.
+    The driver pools its own sessions and is reused across calls, so it is
+    not closed here.
     """
-    # get_neo4j_driver already imported above
-    # get_neo4j_driver already imported above
-    driver = None
-    try:
-        driver = await get_neo4j_driver()  # Await the async function
-        yield driver
-    finally:
-        if driver:
-            # Neo4j driver.close() is synchronous, run in a thread
-            await asyncio.to_thread(driver.close)
+    yield await get_shared_neo4j_driver()
 
 
 @asynccontextmanager
 async def sql_connection_context():
     """
     Asynchronous context manager for SQL Server connection and cursor.
-    Ensures connection and cursor are properly closed.
+    The cursor is closed here; the connection goes back to the pool.
     """
-    conn = None
-    cursor = None
-    try:
-        connection_manager = await get_sql_server_connection()
-        async with connection_manager as conn:
-            cursor = await asyncio.to_thread(conn.cursor)
-            yield conn, cursor
-            if cursor:
-                await asyncio.to_thread(cursor.close)
-    finally:
-        pass  # Connection is closed by context manager
+    connection_manager = await get_sql_server_connection()
+    async with connection_manager as conn:
+        cursor = await asyncio.to_thread(conn.cursor)
+        yield conn, cursor
+        await asyncio.to_thread(cursor.close)
 
 
 logger = logging.getLogger(__name__)
 
-ALLOWED_EXTENSIONS = {"txt", "pdf", "png", "jpg", "jpeg", "mp3", "wav"}
-
 
 @asynccontextmanager
 async def milvus_connection_context():
     """
-    Asynchronous context manager for Milvus client.
-    Ensures the client is properly closed.
+    Asynchronous context manager for the shared Milvus client.
+    The client is reused across calls, so it is not closed here.
     """
-    client = None
-    try:
-        client = await get_milvus_client()  # Await the async function
-        yield client
-    finally:
-        if client:
-            try:
-                # MilvusClient.close() is synchronous, run in a thread
-                await asyncio.to_thread(client.close)
-            except MilvusException as e:
-                logger.error("Error closing Milvus client: %s", e)
+    yield await get_shared_milvus_client()
+
+
+# Seconds a fetched Key Vault secret is served from memory before refetching.
+KEYVAULT_SECRET_TTL = 300
+_keyvault_secrets: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+
+@lru_cache(maxsize=None)
+def _get_keyvault_client(vault_url: str) -> SecretClient:
+    """One credential and client per vault, reusing its token and HTTP session."""
+    return SecretClient(vault_url=vault_url, credential=DefaultAzureCredential())
 
 
 def get_secret_from_keyvault(
@@ -90,15 +84,20 @@ def get_secret_from_keyvault(
 ) -> str | None:
     """
     Retrieve a secret from Azure Key Vault using default credentials.
+
+    Values are cached for KEYVAULT_SECRET_TTL seconds per (vault, secret).
     """
     vault_url = vault_url or os.getenv("AZURE_KEYVAULT_URL")
     if not vault_url:
         logger.error("Key Vault URL not set.")
         return None
+    key = (vault_url, secret_name)
+    cached = _keyvault_secrets.get(key)
+    if cached is not None and time.monotonic() - cached[0] < KEYVAULT_SECRET_TTL:
+        return cached[1]
     try:
-        credential = DefaultAzureCredential()
-        client = SecretClient(vault_url=vault_url, credential=credential)
-        secret = client.get_secret(secret_name)
+        secret = _get_keyvault_client(vault_url).get_secret(secret_name)
+        _keyvault_secrets[key] = (time.monotonic(), secret.value)
         return secret.value
     except (OSError, ValueError, TypeError) as e:
         logger.error(
@@ -107,44 +106,147 @@ def get_secret_from_keyvault(
         return None
 
 
+def _extract_txt(file_path: str) -> str:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _extract_pdf(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return "\n".join(page.extract_text() for page in reader.pages)
+
+
+def _extract_image(file_path: str) -> str:
+    return pytesseract.image_to_string(Image.open(file_path))
+
+
+def _extract_audio(file_path: str) -> None:
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(file_path) as source:
+        recognizer.record(source)
+    # Google Speech API not available in this environment
+    logger.error("Audio extraction not supported for file: %s", file_path)
+    return None
+
+
+# Extension -> extractor; also the source of truth for allowed uploads.
+_EXTRACTORS = {
+    "txt": _extract_txt,
+    "pdf": _extract_pdf,
+    "png": _extract_image,
+    "jpg": _extract_image,
+    "jpeg": _extract_image,
+    "mp3": _extract_audio,
+    "wav": _extract_audio,
+}
+ALLOWED_EXTENSIONS = frozenset(_EXTRACTORS)
+
+
 def allowed_file(filename: str) -> bool:
     """
     Check if the file extension is allowed.
     """
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in _EXTRACTORS
 
 
 def extract_text(file_path: str, file_extension: str) -> str | None:
     """
     Extract text from a file based on its extension.
     """
+    extractor = _EXTRACTORS.get(file_extension.lower())
+    if extractor is None:
+        logger.warning("Unsupported file type for text extraction: %s", file_extension)
+        return None
     try:
-        if file_extension == "txt":
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
-        elif file_extension == "pdf":
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                return "\n".join(page.extract_text() for page in reader.pages)
-        elif file_extension in {"png", "jpg", "jpeg"}:
-            return pytesseract.image_to_string(Image.open(file_path))
-        elif file_extension in {"mp3", "wav"}:
-            recognizer = sr.Recognizer()
-            with sr.AudioFile(file_path) as source:
-                recognizer.record(source)
-            # Google Speech API not available in this environment
-            logger.error("Audio extraction not supported for file: %s", file_path)
-            return None
-        else:
-            logger.warning(
-                "Unsupported file type for text extraction: %s", file_extension
-            )
-            return None
+        return extractor(file_path)
     except (OSError, sr.UnknownValueError) as e:
         logger.error("Failed to extract text from %s: %s", file_path, e)
         return None
 
 
+# PDFs with at least this many pages are split across worker processes;
+# smaller ones are not worth the per-worker re-parse of the file.
+PDF_PARALLEL_MIN_PAGES = 16
+# Upper bound on PDF worker processes, so uploads cannot claim every core.
+PDF_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_pdf_executor = None
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Create the PDF worker pool on first use and keep it for later uploads.
+
+    Workers are spawned rather than forked: the server process runs threads
+    (the event loop, the async runner, pyodbc), and forking it is unsafe.
+    """
+    global _pdf_executor
+    if _pdf_executor is None:
+        _pdf_executor = ProcessPoolExecutor(
+            max_workers=PDF_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_executor
+
+
+async def shutdown_pdf_executor() -> None:
+    """Stop the PDF worker pool, if one was started; called at server shutdown."""
+    global _pdf_executor
+    executor, _pdf_executor = _pdf_executor, None
+    if executor is not None:
+        await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract pages [start, stop) of a PDF; runs in a worker process."""
+    with open(file_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+def _pdf_page_count(file_path: str) -> int:
+    with open(file_path, "rb") as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+async def extract_text_async(file_path: str, file_extension: str) -> str | None:
+    """
+    Non-blocking ``extract_text``. Large PDFs are extracted in parallel page
+    ranges on a process pool; everything else runs in a worker thread.
+    """
+    file_extension = file_extension.lower()
+    if file_extension != "pdf":
+        return await asyncio.to_thread(extract_text, file_path, file_extension)
+    try:
+        num_pages = await asyncio.to_thread(_pdf_page_count, file_path)
+    except OSError as e:
+        logger.error("Failed to extract text from %s: %s", file_path, e)
+        return None
+    if num_pages < PDF_PARALLEL_MIN_PAGES:
+        return await asyncio.to_thread(extract_text, file_path, file_extension)
+
+    workers = min(PDF_MAX_WORKERS, num_pages)
+    step = -(-num_pages // workers)
+    loop = asyncio.get_running_loop()
+    executor = _get_pdf_executor()
+    try:
+        ranges = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    _extract_pdf_pages,
+                    file_path,
+                    start,
+                    min(start + step, num_pages),
+                )
+                for start in range(0, num_pages, step)
+            )
+        )
+    except OSError as e:
+        logger.error("Failed to extract text from %s: %s", file_path, e)
+        return None
+    return "\n".join(page for pages in ranges for page in pages)
+
+
 async def update_agent_log_feedback(
     log_id: int, feedback_text: str, rating: int | None, feedback_type: str
 ) -> tuple[bool, str | None]:
@@ -185,69 +287,100 @@ async def update_agent_log_feedback(
         return False, "Internal server error during feedback update."
 
 
+_WORD_RE = re.compile(r"\S+")
+
+
 def chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
     """
     Simple text chunking function.
+
+    Windows of ``chunk_size`` words, ``chunk_size - overlap`` words apart, are
+    sliced straight out of ``text`` using word offsets found in one pass.
     """
     if not text:
         return []
-    chunks = []
-    words = text.split()
-    i = 0
-    while i < len(words):
-        end = i + chunk_size
-        chunk = " ".join(words[i:end])
-        chunks.append(chunk)
-        i += chunk_size - overlap
-    return chunks
+    spans = [match.span() for match in _WORD_RE.finditer(text)]
+    step = max(chunk_size - overlap, 1)
+    return [
+        text[spans[i][0] : spans[min(i + chunk_size, len(spans)) - 1][1]]
+        for i in range(0, len(spans), step)
+    ]
+
+
+# Per-backend probe budget, so one hung database cannot stall the others.
+HEALTH_CHECK_TIMEOUT = 2.0
 
 
 async def check_database_health(
     get_milvus_client_fn=None,
     get_neo4j_driver_fn=None,
     get_sql_server_connection_fn=None,
+    timeout: float = HEALTH_CHECK_TIMEOUT,
 ):
-    milvus_ok = False
-    neo4j_ok = False
-    sql_server_ok = False
+    """Ping each backend over a long-lived client or pooled connection.
 
-    get_milvus_client_fn = get_milvus_client_fn or get_milvus_client
-    get_neo4j_driver_fn = get_neo4j_driver_fn or get_neo4j_driver
+    The shared clients are reused across checks and never closed here, so a
+    probe costs one round trip rather than a fresh handshake and teardown.
+    """
+    get_milvus_client_fn = get_milvus_client_fn or get_shared_milvus_client
+    get_neo4j_driver_fn = get_neo4j_driver_fn or get_shared_neo4j_driver
     get_sql_server_connection_fn = (
         get_sql_server_connection_fn or get_sql_server_connection
     )
 
-    # Check Milvus
-    try:
-        milvus_client = await get_milvus_client_fn()
-        if milvus_client:
-            milvus_ok = True
-            if hasattr(milvus_client, "close"):
-                milvus_client.close()
-    except MilvusException:
-        milvus_ok = False
-
-    # Check Neo4j
-    try:
-        neo4j_driver = await get_neo4j_driver_fn()
-        if neo4j_driver:
-            neo4j_ok = True
-            if hasattr(neo4j_driver, "close"):
-                neo4j_driver.close()
-    except Neo4jError:
-        neo4j_ok = False
-
-    # Check SQL Server
-    if pyodbc is None:
-        sql_server_ok = False
-    else:
+    async def probe_milvus():
+        try:
+            milvus_client = await get_milvus_client_fn()
+            if not milvus_client:
+                return False
+            await asyncio.to_thread(milvus_client.get_server_version)
+        except MilvusException:
+            return False
+        return True
+
+    async def probe_neo4j():
         try:
-            async with get_sql_server_connection_fn() as conn:
-                if conn is not None:
-                    sql_server_ok = True
+            neo4j_driver = await get_neo4j_driver_fn()
+            if not neo4j_driver:
+                return False
+            await neo4j_driver.verify_connectivity()
+        except Neo4jError:
+            return False
+        return True
+
+    def ping_sql_server(conn):
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            return cursor.fetchone() is not None
+        finally:
+            cursor.close()
+
+    async def probe_sql_server():
+        if pyodbc is None:
+            return False
+        try:
+            connection_manager = await get_sql_server_connection_fn()
+            async with connection_manager as conn:
+                if conn is None:
+                    return False
+                return await asyncio.to_thread(ping_sql_server, conn)
         except pyodbc.Error:
-            sql_server_ok = False
+            return False
+
+    # Probes are I/O-bound, so run them concurrently: latency is the slowest
+    # backend rather than the sum of all three.
+    results = await asyncio.gather(
+        asyncio.wait_for(probe_milvus(), timeout),
+        asyncio.wait_for(probe_neo4j(), timeout),
+        asyncio.wait_for(probe_sql_server(), timeout),
+        return_exceptions=True,
+    )
+    for name, result in zip(("milvus", "neo4j", "sql_server"), results, strict=True):
+        if isinstance(result, BaseException):
+            logger.warning("Health probe for %s failed: %r", name, result)
 
+    milvus_ok, neo4j_ok, sql_server_ok = (result is True for result in results)
     return {
         "milvus": milvus_ok,
         "neo4j": neo4j_ok,
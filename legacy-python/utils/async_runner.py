@@ -1,17 +1,39 @@
 import asyncio
+import logging
 import threading
-import traceback  # Added this import
+import traceback
+from concurrent.futures import Future
 from typing import Any, Callable, Optional
 
+logger = logging.getLogger(__name__)
+
+# One long-lived loop serves every submission, so each call costs a queue
+# hand-off rather than a new thread and event loop.
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Start the shared daemon loop thread on first use."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="async-runner", daemon=True
+            ).start()
+            _background_loop = loop
+    return _background_loop
+
 
 def run_async_in_thread(
     async_func: Callable[..., Any],
     *args: Any,
     callback: Optional[Callable[[Any], None]] = None,
     **kwargs: Any,
-) -> threading.Thread:
+) -> Future:
     """
-    Runs an asynchronous function in a new background thread.
+    Runs an asynchronous function on the shared background event loop.
 
     Args:
         async_func: The asynchronous function to run.
@@ -21,23 +43,30 @@ def run_async_in_thread(
         **kwargs: Keyword arguments to pass to the async function.
 
     Returns:
-        The threading.Thread object.
+        A concurrent.futures.Future for the result; ``result()`` blocks
+        until the coroutine finishes.
     """
 
-    def task():
-        try:
-            result = asyncio.run(async_func(*args, **kwargs))
-            if callback:
-                callback(result)
-        except Exception as e:
+    def on_done(future: Future):
+        exc = future.exception()
+        if exc is None:
             if callback:
-                callback({"error": str(e), "traceback": traceback.format_exc()})
-            else:
-                # Log the error if no callback is provided to handle it
-                import logging
-
-                logging.error(f"Error in background async task: {e}", exc_info=True)
+                callback(future.result())
+        elif callback:
+            callback(
+                {
+                    "error": str(exc),
+                    "traceback": "".join(
+                        traceback.format_exception(type(exc), exc, exc.__traceback__)
+                    ),
+                }
+            )
+        else:
+            # Log the error if no callback is provided to handle it
+            logger.error(f"Error in background async task: {exc}", exc_info=exc)
 
-    thread = threading.Thread(target=task)
-    thread.start()
-    return thread
+    future = asyncio.run_coroutine_threadsafe(
+        async_func(*args, **kwargs), _get_background_loop()
+    )
+    future.add_done_callback(on_done)
+    return future
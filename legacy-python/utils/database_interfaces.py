@@ -1,18 +1,69 @@
 """Database service interfaces and abstractions."""
+import asyncio
+import hashlib
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Awaitable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 import logging
+
+import numpy as np
+
 from utils.error_handlers import ErrorCode, StandardizedError, DatabaseErrorHandler
 
 logger = logging.getLogger(__name__)
 
+# Deadline for all of search_all's backend searches; whichever are still
+# running are cancelled, so a slow database cannot hold back the others.
+SEARCH_TIMEOUT = 10.0
+# Cap on any one backend's is_healthy() probe, so a hung database cannot stall
+# the health endpoint.
+HEALTH_CHECK_TIMEOUT = 2.0
+# How long a probe result is reused before the backend is pinged again.
+HEALTH_CHECK_TTL = 2.0
+VECTOR_CACHE_SIZE = 1024
+# Seconds a cached search result is served. Ingestion upserts into Milvus
+# directly rather than through insert_vectors, so expiry is what bounds how
+# stale a cached query can be.
+VECTOR_CACHE_TTL = 60.0
+# Cosine similarity at which a near-identical query embedding reuses a recent
+# query's results, and how many recent queries are kept for that comparison.
+VECTOR_CACHE_SEMANTIC_THRESHOLD = 0.97
+VECTOR_CACHE_SEMANTIC_SLOTS = 1024
+# Most (collection, limit, filters) scopes that keep a ring of recent query
+# embeddings; the least recently used scope's ring is dropped beyond this.
+VECTOR_CACHE_SEMANTIC_SCOPES = 64
+# Rows a ring's embedding matrix starts with before it grows toward its slots.
+_RING_INITIAL_ROWS = 16
+
+# A query vector: a float sequence, or preferably a float32 numpy array, which
+# passes through the cache and into pymilvus without per-element boxing.
+Embedding = Union[Sequence[float], np.ndarray]
+
+
+def as_query_vector(embedding: Embedding) -> np.ndarray:
+    """Contiguous float32 view of an embedding; no copy if it already is one."""
+    return np.ascontiguousarray(embedding, dtype=np.float32)
+
 
 class DatabaseService(ABC):
-    """Abstract base class for database services."""
+    """Abstract base class for database services.
+
+    Implementations must not own a connection per instance: queries draw on
+    the process-wide clients and pools in ``db_connectors`` (the shared Milvus
+    client, the per-loop Neo4j driver and SQL Server pool), so concurrent
+    requests are not serialized through one socket. ``connect()`` attaches
+    to that shared pool and ``disconnect()`` only drops the reference.
+    """
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Resolved once per class rather than on every instantiation
+        cls._logger = logging.getLogger(f"{__name__}.{cls.__name__}")
+
     def __init__(self, name: str):
         self.name = name
-        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
     @abstractmethod
     async def connect(self) -> bool:
@@ -35,12 +86,30 @@ class VectorSearchService(DatabaseService):
     
     @abstractmethod
     async def search_by_vector(self, 
-                              embedding: List[float], 
+                              embedding: Embedding, 
                               collection: str,
                               limit: int = 5,
                               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search for similar vectors."""
         pass
+
+    async def search_by_vectors(self,
+                               embeddings: Sequence[Embedding],
+                               collection: str,
+                               limit: int = 5,
+                               filters: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """Search several query vectors; one result list per embedding, in order.
+
+        The default issues one ``search_by_vector`` per embedding concurrently;
+        backends with a native multi-vector search should override it.
+        """
+        results = await asyncio.gather(
+            *(self.search_by_vector(embedding, collection, limit, filters) for embedding in embeddings)
+        )
+        for found in results:
+            if isinstance(found, dict) and found.get("status") == "error":
+                return found
+        return list(results)
         
     @abstractmethod
     async def insert_vectors(self, 
@@ -50,6 +119,281 @@ class VectorSearchService(DatabaseService):
         pass
 
 
+def canonical_filter_key(filters: Optional[Dict[str, Any]]) -> Tuple:
+    """Hashable, order-independent fingerprint of a search ``filters`` dict.
+
+    Keys are sorted at every level and lists become tuples, so equivalent
+    filters built in a different insertion order share cache entries.
+    """
+    if not filters:
+        return ()
+    return tuple(sorted((key, _canonical_filter_value(value)) for key, value in filters.items()))
+
+
+def _canonical_filter_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return canonical_filter_key(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical_filter_value(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class _EmbeddingRing:
+    """Bounded ring of unit-normalized query embeddings and their results.
+
+    Embeddings live in one contiguous float32 matrix, so a lookup is a single
+    matrix-vector product. The matrix starts small and doubles until it holds
+    ``slots`` rows; after that, inserts overwrite the oldest slot. Each slot
+    records when it was stored so expired slots are never matched.
+    """
+
+    def __init__(self, slots: int, dim: int):
+        self.slots = slots
+        rows = min(slots, _RING_INITIAL_ROWS)
+        self.matrix = np.zeros((rows, dim), dtype=np.float32)
+        self.stored_at = np.zeros(rows, dtype=np.float64)
+        self.results: List[List[Dict[str, Any]]] = []
+        self.next = 0
+
+    def nearest(
+        self, vector: np.ndarray, threshold: float, fresh_after: float
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Results of the closest slot stored after ``fresh_after``, if close enough."""
+        filled = len(self.results)
+        if not filled or vector.shape[0] != self.matrix.shape[1]:
+            return None
+        scores = self.matrix[:filled] @ vector
+        scores[self.stored_at[:filled] <= fresh_after] = -np.inf
+        best = int(np.argmax(scores))
+        return self.results[best] if scores[best] >= threshold else None
+
+    def add(self, vector: np.ndarray, results: List[Dict[str, Any]], now: float) -> None:
+        if not self.slots or vector.shape[0] != self.matrix.shape[1]:
+            return
+        if self.next == self.matrix.shape[0]:
+            if self.next < self.slots:
+                self._grow()
+            else:
+                self.next = 0
+        self.matrix[self.next] = vector
+        self.stored_at[self.next] = now
+        if self.next < len(self.results):
+            self.results[self.next] = results
+        else:
+            self.results.append(results)
+        self.next += 1
+
+    def _grow(self) -> None:
+        rows = min(self.slots, 2 * self.matrix.shape[0])
+        matrix = np.zeros((rows, self.matrix.shape[1]), dtype=np.float32)
+        matrix[: self.matrix.shape[0]] = self.matrix
+        stored_at = np.zeros(rows, dtype=np.float64)
+        stored_at[: self.stored_at.shape[0]] = self.stored_at
+        self.matrix, self.stored_at = matrix, stored_at
+
+
+class CachedVectorSearchService(VectorSearchService):
+    """LRU cache of search results in front of another ``VectorSearchService``.
+
+    Results are keyed by ``(collection, limit, embedding digest, filters)``;
+    the digest is taken over the float32 bytes, so a list and a numpy array of
+    the same values share an entry. On an exact miss, a ring of recent query
+    embeddings per ``(collection, limit, filters)`` is checked and a query
+    within ``semantic_threshold`` cosine similarity reuses that query's
+    results; pass ``semantic_threshold=None`` to disable it. Rings are kept for
+    at most ``semantic_scopes`` scopes, dropping the least recently used, and
+    each grows only as queries arrive. Concurrent misses
+    for the same key share one backend request. Results expire ``ttl``
+    seconds after they are fetched. Error results are never cached, and an
+    insert into a collection drops its entries.
+    """
+
+    def __init__(
+        self,
+        inner: VectorSearchService,
+        max_entries: int = VECTOR_CACHE_SIZE,
+        semantic_threshold: Optional[float] = VECTOR_CACHE_SEMANTIC_THRESHOLD,
+        semantic_slots: int = VECTOR_CACHE_SEMANTIC_SLOTS,
+        semantic_scopes: int = VECTOR_CACHE_SEMANTIC_SCOPES,
+        ttl: float = VECTOR_CACHE_TTL,
+    ):
+        super().__init__(inner.name)
+        self.inner = inner
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.semantic_threshold = semantic_threshold
+        self.semantic_slots = semantic_slots
+        self.semantic_scopes = semantic_scopes
+        # key -> (monotonic time fetched, results)
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # (collection, limit, filters key) -> ring of recent query embeddings
+        self._rings: "OrderedDict[Tuple, _EmbeddingRing]" = OrderedDict()
+        # key -> future for the backend request currently fetching it
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        # Counters and the LRU are only touched from the event loop thread and
+        # never across an await, so plain increments cannot interleave; they
+        # deliberately take no lock.
+        self.hits = 0
+        self.semantic_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+
+    async def connect(self) -> bool:
+        return await self.inner.connect()
+
+    async def disconnect(self) -> None:
+        await self.inner.disconnect()
+
+    async def is_healthy(self) -> bool:
+        return await self.inner.is_healthy()
+
+    async def search_by_vector(self,
+                              embedding: Embedding,
+                              collection: str = None,
+                              limit: int = 5,
+                              filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        vector, scope, key = self._cache_key(embedding, collection, limit, filters)
+        cached, unit = self._lookup(vector, scope, key)
+        if cached is not None:
+            return cached
+
+        # Single flight: identical concurrent misses await the first caller's
+        # backend request instead of each sending their own
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                results = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling() or not inflight.cancelled():
+                    raise
+                # Only the first caller was cancelled; fetch it ourselves
+                return await self.search_by_vector(vector, collection, limit, filters)
+            return list(results) if isinstance(results, list) else results
+
+        self.misses += 1
+        inflight = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            results = await self.inner.search_by_vector(vector, collection, limit, filters)
+        except asyncio.CancelledError:
+            inflight.cancel()
+            raise
+        except Exception as e:
+            inflight.set_exception(e)
+            inflight.exception()  # retrieved here, so no waiters is not an error
+            raise
+        finally:
+            del self._inflight[key]
+        inflight.set_result(results)
+        if isinstance(results, list):
+            self._store(scope, key, unit, results)
+        return results
+
+    async def search_by_vectors(self,
+                               embeddings: Sequence[Embedding],
+                               collection: str = None,
+                               limit: int = 5,
+                               filters: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """Serve cached embeddings and send only the misses upstream, in one batch."""
+        keys = [self._cache_key(embedding, collection, limit, filters) for embedding in embeddings]
+        lookups = [self._lookup(*key) for key in keys]
+        results = [cached for cached, _ in lookups]
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        self.misses += len(misses)
+        if misses:
+            found = await self.inner.search_by_vectors(
+                [embeddings[i] for i in misses], collection, limit, filters
+            )
+            if not isinstance(found, list):
+                return found
+            for i, hits in zip(misses, found, strict=True):
+                _, scope, key = keys[i]
+                self._store(scope, key, lookups[i][1], hits)
+                results[i] = hits
+        return results
+
+    def _cache_key(self, embedding, collection, limit, filters) -> Tuple[np.ndarray, Tuple, Tuple]:
+        vector = as_query_vector(embedding)
+        scope = (
+            collection,
+            limit,
+            canonical_filter_key(filters),
+        )
+        return vector, scope, scope + (hashlib.sha256(vector.tobytes()).digest(),)
+
+    def _lookup(
+        self, vector: np.ndarray, scope: Tuple, key: Tuple
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[np.ndarray]]:
+        """Return ``(cached_results, unit_vector)``; the results are None on a miss."""
+        fresh_after = time.monotonic() - self.ttl
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > fresh_after:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(entry[1]), None
+            del self._entries[key]
+
+        norm = np.linalg.norm(vector) if self.semantic_threshold is not None else 0.0
+        unit = vector / norm if norm else None
+        ring = self._rings.get(scope)
+        if unit is not None and ring is not None:
+            self._rings.move_to_end(scope)
+            cached = ring.nearest(unit, self.semantic_threshold, fresh_after)
+            if cached is not None:
+                self.semantic_hits += 1
+                return list(cached), unit
+
+        return None, unit
+
+    def _store(
+        self, scope: Tuple, key: Tuple, unit: Optional[np.ndarray], results: List[Dict[str, Any]]
+    ) -> None:
+        now = time.monotonic()
+        results = list(results)
+        self._entries[key] = (now, results)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if unit is not None:
+            ring = self._rings.get(scope)
+            if ring is None:
+                ring = self._rings[scope] = _EmbeddingRing(self.semantic_slots, unit.shape[0])
+                if len(self._rings) > self.semantic_scopes:
+                    self._rings.popitem(last=False)
+            else:
+                self._rings.move_to_end(scope)
+            ring.add(unit, results, now)
+
+    async def insert_vectors(self,
+                            collection: str,
+                            vectors: List[Dict[str, Any]]) -> bool:
+        result = await self.inner.insert_vectors(collection, vectors)
+        for key in [key for key in self._entries if key[0] in (collection, None)]:
+            del self._entries[key]
+        for scope in [scope for scope in self._rings if scope[0] in (collection, None)]:
+            del self._rings[scope]
+        return result
+
+    def stats(self) -> Mapping[str, Any]:
+        """Read-only snapshot of the hit/miss counters and current size."""
+        served = self.hits + self.semantic_hits + self.coalesced
+        lookups = served + self.misses
+        return MappingProxyType({
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": served / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+        })
+
+
 class GraphSearchService(DatabaseService):
     """Abstract interface for graph databases (like Neo4j)."""
     
@@ -60,6 +404,20 @@ class GraphSearchService(DatabaseService):
                           filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search nodes based on text query."""
         pass
+
+    async def search_nodes_batch(self,
+                                queries: Sequence[str],
+                                limit: int = 10) -> List[List[Dict[str, Any]]]:
+        """Search several text queries; one result list per query, in order.
+
+        The default issues one ``search_nodes`` per query concurrently;
+        backends that can run them in a single round trip should override it.
+        """
+        results = await asyncio.gather(*(self.search_nodes(query, limit) for query in queries))
+        for found in results:
+            if isinstance(found, dict) and found.get("status") == "error":
+                return found
+        return list(results)
         
     @abstractmethod 
     async def create_relationship(self, 
@@ -91,6 +449,8 @@ class RelationalSearchService(DatabaseService):
 
 class UnifiedSearchService:
     """Unified service that coordinates searches across all databases."""
+
+    _logger = logging.getLogger(__name__)
     
     def __init__(self, 
                  vector_service: Optional[VectorSearchService] = None,
@@ -99,70 +459,188 @@ class UnifiedSearchService:
         self.vector_service = vector_service
         self.graph_service = graph_service
         self.relational_service = relational_service
-        self._logger = logging.getLogger(__name__)
+        # name -> (monotonic timestamp, probe outcome)
+        self._health_cache: Dict[str, Tuple[float, Union[bool, BaseException]]] = {}
+        self._health_locks: Dict[str, asyncio.Lock] = {}
+        self._health_ttl = HEALTH_CHECK_TTL
         
     async def search_all(self, 
                         query: str, 
-                        embedding: Optional[List[float]] = None,
+                        embedding: Optional[Embedding] = None,
                         limit: int = 5) -> Dict[str, Any]:
-        """Search across all available databases."""
+        """Search across all available databases concurrently."""
         results = {
             "vector_results": [],
             "graph_results": [],
             "relational_results": [],
             "errors": []
         }
-        
-        # Vector search
-        if self.vector_service and embedding:
+
+        searches = {}
+        if self.vector_service and embedding is not None and len(embedding):
+            # Converted once here; the cache and pymilvus reuse the same buffer
+            searches["vector"] = self.vector_service.search_by_vector(
+                as_query_vector(embedding), "default_collection", limit
+            )
+        if self.graph_service:
+            searches["graph"] = self.graph_service.search_nodes(query, limit)
+        # Relational search would be query-dependent, so skipping for now
+
+        for name, (found, error) in (await self._run_searches(searches)).items():
+            if error is not None:
+                results["errors"].append(error)
+            else:
+                results[f"{name}_results"] = found
+
+        return results
+
+    async def search_all_batch(self,
+                              queries: Sequence[Tuple[str, Optional[Embedding]]],
+                              limit: int = 5,
+                              collection: str = "default_collection") -> List[Dict[str, Any]]:
+        """Search many ``(query, embedding)`` pairs with one call per backend.
+
+        All embeddings go to Milvus as one multi-vector search and all query
+        texts to the graph backend as one batched query. Returns one
+        ``search_all``-shaped dict per query, in order; a backend failure is
+        reported in every query's ``errors``.
+        """
+        batch = [
+            {
+                "query": query,
+                "vector_results": [],
+                "graph_results": [],
+                "relational_results": [],
+                "errors": []
+            }
+            for query, _ in queries
+        ]
+        with_embedding = [
+            i for i, (_, embedding) in enumerate(queries)
+            if embedding is not None and len(embedding)
+        ]
+
+        searches = {}
+        if self.vector_service and with_embedding:
+            # One contiguous (N, d) block; rows are handed on without re-boxing
+            matrix = np.asarray([queries[i][1] for i in with_embedding], dtype=np.float32)
+            searches["vector"] = self.vector_service.search_by_vectors(
+                list(matrix), collection, limit
+            )
+        if self.graph_service and queries:
+            searches["graph"] = self.graph_service.search_nodes_batch(
+                [query for query, _ in queries], limit
+            )
+
+        for name, (found, error) in (await self._run_searches(searches)).items():
+            if error is not None:
+                for result in batch:
+                    result["errors"].append(error)
+                continue
+            targets = with_embedding if name == "vector" else range(len(batch))
+            for i, hits in zip(targets, found, strict=True):
+                batch[i][f"{name}_results"] = hits
+
+        return batch
+
+    async def _run_searches(
+        self, searches: Dict[str, Awaitable[Any]]
+    ) -> Dict[str, Tuple[Any, Optional[Dict[str, Any]]]]:
+        """Await backend searches concurrently under one SEARCH_TIMEOUT deadline.
+
+        Returns ``{name: (results, error)}`` where ``error`` is None on success
+        and a standardized error dict otherwise. There is no separate
+        ``is_healthy()`` round trip: a down backend fails its search instead.
+        Searches run in a TaskGroup, so stragglers past the deadline, or all
+        of them if the caller is cancelled, are cancelled rather than orphaned;
+        results that finished in time are kept.
+        """
+        outcomes: Dict[str, Any] = {}
+
+        async def run(name: str, search: Awaitable[Any]) -> None:
             try:
-                if await self.vector_service.is_healthy():
-                    results["vector_results"] = await self.vector_service.search_by_vector(
-                        embedding, "default_collection", limit
-                    )
-                else:
-                    results["errors"].append("Vector service unhealthy")
+                outcomes[name] = await search
             except Exception as e:
-                error = DatabaseErrorHandler.handle_connection_error(e, "vector")
-                results["errors"].append(error.to_dict())
+                outcomes[name] = e
+
+        try:
+            async with asyncio.timeout(SEARCH_TIMEOUT):
+                async with asyncio.TaskGroup() as tg:
+                    for name, search in searches.items():
+                        tg.create_task(run(name, search))
+        except TimeoutError:
+            for name in searches:
+                outcomes.setdefault(
+                    name, TimeoutError(f"{name} search exceeded {SEARCH_TIMEOUT}s")
+                )
+
+        folded = {}
+        for name in searches:
+            outcome = outcomes[name]
+            if isinstance(outcome, BaseException):
+                error = DatabaseErrorHandler.handle_connection_error(outcome, name)
+                folded[name] = ([], error.to_dict())
+            elif isinstance(outcome, dict) and outcome.get("status") == "error":
+                # safe_execute-wrapped searches return their error instead of raising
+                folded[name] = ([], outcome)
+            else:
+                folded[name] = (outcome, None)
+                continue
+            # A failed query drops the cached probe so the next check re-pings
+            self._health_cache.pop(name, None)
+        return folded
         
-        # Graph search  
-        if self.graph_service:
+    def _services(self) -> List[Tuple[str, DatabaseService]]:
+        """The configured backends as ``(name, service)`` pairs."""
+        services = [
+            ("vector", self.vector_service),
+            ("graph", self.graph_service),
+            ("relational", self.relational_service),
+        ]
+        return [(name, service) for name, service in services if service]
+
+    async def _probe_health(self) -> Dict[str, Union[bool, BaseException]]:
+        """Probe every configured backend concurrently, each under HEALTH_CHECK_TIMEOUT.
+
+        Returns ``{name: healthy}``, with the exception in place of the flag
+        for a probe that raised or timed out. Outcomes younger than
+        ``_health_ttl`` are served from cache.
+        """
+        present = self._services()
+        outcomes = await asyncio.gather(
+            *(self._cached_health(name, service) for name, service in present)
+        )
+        return {name: outcome for (name, _), outcome in zip(present, outcomes, strict=True)}
+
+    async def _cached_health(
+        self, name: str, service: DatabaseService
+    ) -> Union[bool, BaseException]:
+        """One backend's probe outcome, reused for ``_health_ttl`` seconds.
+
+        Concurrent callers wait on a per-backend lock, so a burst of health
+        checks sends a single ping rather than one each. A fresh cached
+        outcome is returned without touching the lock.
+        """
+        cached = self._health_cache.get(name)
+        if cached is not None and time.monotonic() - cached[0] < self._health_ttl:
+            return cached[1]
+        lock = self._health_locks.get(name)
+        if lock is None:
+            lock = self._health_locks[name] = asyncio.Lock()
+        async with lock:
+            cached = self._health_cache.get(name)
+            if cached is not None and time.monotonic() - cached[0] < self._health_ttl:
+                return cached[1]
             try:
-                if await self.graph_service.is_healthy():
-                    results["graph_results"] = await self.graph_service.search_nodes(
-                        query, limit
-                    )
-                else:
-                    results["errors"].append("Graph service unhealthy")
+                outcome = await asyncio.wait_for(service.is_healthy(), HEALTH_CHECK_TIMEOUT)
             except Exception as e:
-                error = DatabaseErrorHandler.handle_connection_error(e, "graph")
-                results["errors"].append(error.to_dict())
-        
-        # Relational search would be query-dependent, so skipping for now
-        
-        return results
-        
+                outcome = e
+            self._health_cache[name] = (time.monotonic(), outcome)
+            return outcome
+
     async def health_check(self) -> Dict[str, bool]:
         """Check health of all database services."""
-        health_status = {}
-        
-        if self.vector_service:
-            try:
-                health_status["vector"] = await self.vector_service.is_healthy()
-            except Exception:
-                health_status["vector"] = False
-                
-        if self.graph_service:
-            try:
-                health_status["graph"] = await self.graph_service.is_healthy()
-            except Exception:
-                health_status["graph"] = False
-                
-        if self.relational_service:
-            try:
-                health_status["relational"] = await self.relational_service.is_healthy()
-            except Exception:
-                health_status["relational"] = False
-                
-        return health_status
\ No newline at end of file
+        return {
+            name: outcome is True
+            for name, outcome in (await self._probe_health()).items()
+        }
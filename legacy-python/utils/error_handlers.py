@@ -1,11 +1,19 @@
 import logging
-import traceback
+import re
 from enum import Enum
-from typing import Any, Dict, Optional, Type, Union
-from fastapi.responses import JSONResponse
+from typing import TYPE_CHECKING, Any, Dict, Optional, Type, Union
 from functools import wraps
 import asyncio
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    # Imported where used so workers and CLI tools don't load FastAPI
+    from fastapi.responses import Response
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +35,8 @@ class ErrorCode(Enum):
 
 class StandardizedError:
     """Standardized error response structure."""
+
+    __slots__ = ("error_code", "message", "details", "original_exception", "_code_value")
     
     def __init__(self, 
                  error_code: ErrorCode, 
@@ -37,75 +47,166 @@ class StandardizedError:
         self.message = message
         self.details = details or {}
         self.original_exception = original_exception
+        # Resolved once; to_dict runs on every error response
+        self._code_value = error_code.value
         
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API responses."""
-        result = {
-            "status": "error",
-            "error_code": self.error_code.value,
-            "message": self.message
-        }
         if self.details:
-            result["details"] = self.details
-        return result
+            return {
+                "status": "error",
+                "error_code": self._code_value,
+                "message": self.message,
+                "details": self.details
+            }
+        return {"status": "error", "error_code": self._code_value, "message": self.message}
         
-    def to_json_response(self, status_code: int = 500) -> JSONResponse:
-        """Convert to FastAPI JSONResponse."""
+    def to_json_response(self, status_code: int = 500) -> "Response":
+        """Convert to a FastAPI JSON response, serialized by orjson when installed."""
+        if orjson is not None:
+            from fastapi.responses import Response
+
+            return Response(
+                # Non-str keys are stringified, as json.dumps would
+                content=orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS),
+                media_type="application/json",
+                status_code=status_code,
+            )
+        from fastapi.responses import JSONResponse
+
         return JSONResponse(content=self.to_dict(), status_code=status_code)
 
 
+# Exception chains deeper than this are not followed any further.
+MAX_EXCEPTION_CHAIN_DEPTH = 32
+
+
 def find_error_message(exc: Exception, target: str) -> bool:
-    """Recursively searches for a target string in an exception chain."""
-    while exc:
-        msg = str(exc)
-        if target in msg:
+    """Search an exception and its ``__cause__``/``__context__`` chain for ``target``.
+
+    Each exception is visited at most once, so cyclic chains terminate. A
+    string first argument is checked before falling back to ``str(exc)``,
+    which some drivers make expensive.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen and len(seen) < MAX_EXCEPTION_CHAIN_DEPTH:
+        seen.add(id(exc))
+        first_arg = exc.args[0] if exc.args else ""
+        if isinstance(first_arg, str) and target in first_arg:
+            return True
+        if target in str(exc):
             return True
-        exc = getattr(exc, "__cause__", None) or getattr(exc, "__context__", None)
+        exc = exc.__cause__ or exc.__context__
     return False
 
 
+# Exception types whose class alone decides the category, by qualified name so
+# optional drivers need not be imported here. Subclasses match through the MRO.
+_DECISIVE_TYPES = {
+    "builtins.FileNotFoundError": ErrorCode.FILE_OPERATION,
+    "builtins.PermissionError": ErrorCode.FILE_OPERATION,
+    "pymilvus.exceptions.MilvusException": ErrorCode.DATABASE_QUERY,
+    "neo4j.exceptions.ServiceUnavailable": ErrorCode.DATABASE_CONNECTION,
+    "neo4j.exceptions.Neo4jError": ErrorCode.DATABASE_QUERY,
+    "pyodbc.OperationalError": ErrorCode.DATABASE_CONNECTION,
+    "pyodbc.InterfaceError": ErrorCode.DATABASE_CONNECTION,
+    "pyodbc.Error": ErrorCode.DATABASE_QUERY,
+}
+# type -> decisive code or None, so the MRO walk runs once per exception type
+_type_codes: Dict[type, Optional[ErrorCode]] = {}
+
+
+def _decisive_code(exc_type: type) -> Optional[ErrorCode]:
+    try:
+        return _type_codes[exc_type]
+    except KeyError:
+        pass
+    code = None
+    for cls in exc_type.__mro__:
+        code = _DECISIVE_TYPES.get(f"{cls.__module__}.{cls.__qualname__}")
+        if code is not None:
+            break
+    _type_codes[exc_type] = code
+    return code
+
+
+_DATABASE_TERMS = frozenset({"connection", "database", "sql", "milvus", "neo4j"})
+_LLM_TERMS = frozenset({"llm", "openai", "anthropic", "model"})
+# Lookahead so overlapping terms ("llmilvus") are all reported in one scan
+_CATEGORY_PATTERN = re.compile(
+    r"(?=(connection|database|sql|milvus|neo4j|llm|openai|anthropic|model|timeout|validation))"
+)
+_FILE_ERROR_TYPES = ("filenotfounderror", "permissionerror", "ioerror")
+_VALIDATION_ERROR_TYPES = frozenset({"valueerror", "typeerror"})
+
+
 def categorize_exception(exc: Exception) -> ErrorCode:
     """Categorize exception into appropriate error code."""
-    exc_str = str(exc).lower()
+    # Decided by type alone: skips stringifying large driver messages
+    code = _decisive_code(type(exc))
+    if code is not None:
+        return code
+
+    terms = set(_CATEGORY_PATTERN.findall(str(exc).lower()))
     exc_type = type(exc).__name__.lower()
     
     # Database errors
-    if any(term in exc_str for term in ["connection", "database", "sql", "milvus", "neo4j"]):
-        if "connection" in exc_str:
+    if terms & _DATABASE_TERMS:
+        if "connection" in terms:
             return ErrorCode.DATABASE_CONNECTION
         return ErrorCode.DATABASE_QUERY
     
     # LLM errors
-    if any(term in exc_str for term in ["llm", "openai", "anthropic", "model"]):
-        if "connection" in exc_str or "timeout" in exc_str:
+    if terms & _LLM_TERMS:
+        if "timeout" in terms:
             return ErrorCode.LLM_CONNECTION
         return ErrorCode.LLM_RESPONSE
     
     # File operations
-    if any(term in exc_type for term in ["filenotfounderror", "permissionerror", "ioerror"]):
+    if any(term in exc_type for term in _FILE_ERROR_TYPES):
         return ErrorCode.FILE_OPERATION
     
     # Validation
-    if "validation" in exc_str or exc_type in ["valueerror", "typeerror"]:
+    if "validation" in terms or exc_type in _VALIDATION_ERROR_TYPES:
         return ErrorCode.VALIDATION_ERROR
         
     return ErrorCode.GENERIC_ERROR
 
 
+# Longest exception message or context repr written to the log.
+MAX_LOGGED_EXCEPTION_LENGTH = 2048
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_LOGGED_EXCEPTION_LENGTH:
+        return text
+    return text[:MAX_LOGGED_EXCEPTION_LENGTH] + "…<truncated>"
+
+
 async def handle_api_exception(e: Exception, 
                              default_message: str = "Internal server error",
-                             context: Optional[Dict[str, Any]] = None) -> JSONResponse:
+                             context: Optional[Dict[str, Any]] = None) -> "Response":
     """Centralized exception handler for API endpoints."""
     error_code = categorize_exception(e)
     
-    # Enhanced logging with context
+    # Enhanced logging with context, capped so driver messages carrying whole
+    # queries or server dumps cannot flood the log pipeline during an outage
     log_data = {
         "exception_type": type(e).__name__,
-        "exception_message": str(e),
+        "exception_message": _truncate(str(e)),
         "error_code": error_code.value,
-        "context": context or {}
+        "context": _truncate(repr(context or {}))
     }
-    logger.error(f"API Exception: {log_data}", exc_info=True)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.error(f"API Exception: {log_data}", exc_info=True)
+    else:
+        # Innermost frame only, instead of formatting the whole traceback
+        tb = e.__traceback__
+        while tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        if tb is not None:
+            log_data["raised_at"] = f"{tb.tb_frame.f_code.co_filename}:{tb.tb_lineno}"
+        logger.error(f"API Exception: {log_data}")
     
     # Create standardized error
     standardized_error = StandardizedError(
@@ -122,38 +223,36 @@ def safe_execute(error_code: ErrorCode = ErrorCode.GENERIC_ERROR,
                 default_return: Any = None):
     """Decorator for safe execution with standardized error handling."""
     def decorator(func):
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            try:
-                if asyncio.iscoroutinefunction(func):
+        func_name = func.__name__
+
+        def handle(e: Exception):
+            logger.error(f"Safe execution failed in {func_name}: {e}", exc_info=True)
+            if default_return is not None:
+                return default_return
+            return StandardizedError(
+                error_code=error_code,
+                message=f"Error in {func_name}: {str(e)}",
+                original_exception=e
+            ).to_dict()
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
                     return await func(*args, **kwargs)
-                else:
-                    return await asyncio.to_thread(func, *args, **kwargs)
-            except Exception as e:
-                logger.error(f"Safe execution failed in {func.__name__}: {e}", exc_info=True)
-                if default_return is not None:
-                    return default_return
-                return StandardizedError(
-                    error_code=error_code,
-                    message=f"Error in {func.__name__}: {str(e)}",
-                    original_exception=e
-                ).to_dict()
-        
+                except Exception as e:
+                    return handle(e)
+
+            return async_wrapper
+
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                logger.error(f"Safe execution failed in {func.__name__}: {e}", exc_info=True)
-                if default_return is not None:
-                    return default_return
-                return StandardizedError(
-                    error_code=error_code,
-                    message=f"Error in {func.__name__}: {str(e)}",
-                    original_exception=e
-                ).to_dict()
-        
-        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+                return handle(e)
+
+        return sync_wrapper
     return decorator
 
 
@@ -181,15 +280,54 @@ class DatabaseErrorHandler:
         )
 
 
+# Tool parameters whose values never reach error details or logs.
+_SENSITIVE_PARAMETERS = frozenset({"api_key", "password", "token", "authorization"})
+MAX_PARAMETER_REPR_LENGTH = 256
+MAX_PARAMETER_BYTES = 1024
+
+
+def _sanitize_parameters(
+    parameters: Optional[Dict[str, Any]], max_bytes: int = MAX_PARAMETER_BYTES
+) -> Dict[str, Any]:
+    """Copy of ``parameters`` that is safe and small enough for an error payload.
+
+    Sensitive values become ``"***"``; values whose repr exceeds ``max_bytes``
+    (documents, embeddings, file contents) become a size marker, and shorter
+    oversized values are cut to a truncated repr.
+    """
+    if not parameters:
+        return {}
+    sanitized = {}
+    for key, value in parameters.items():
+        if isinstance(key, str) and key.lower() in _SENSITIVE_PARAMETERS:
+            sanitized[key] = "***"
+            continue
+        if value is None or isinstance(value, (bool, int, float)):
+            sanitized[key] = value
+            continue
+        text = repr(value)
+        if len(text) > max_bytes:
+            sanitized[key] = f"<redacted {len(text)} bytes>"
+        elif len(text) > MAX_PARAMETER_REPR_LENGTH:
+            sanitized[key] = text[:MAX_PARAMETER_REPR_LENGTH] + "…<truncated>"
+        else:
+            sanitized[key] = value
+    return sanitized
+
+
 class ToolErrorHandler:
     """Specialized error handler for tool operations."""
     
     @staticmethod
     def handle_tool_error(exc: Exception, tool_name: str, parameters: Dict[str, Any]) -> StandardizedError:
-        """Handle tool execution errors."""
+        """Handle tool execution errors; parameters are redacted and size-capped."""
         return StandardizedError(
             error_code=ErrorCode.TOOL_EXECUTION,
             message=f"Tool '{tool_name}' execution failed",
-            details={"tool_name": tool_name, "parameters": parameters, "exception": str(exc)},
+            details={
+                "tool_name": tool_name,
+                "parameters": _sanitize_parameters(parameters),
+                "exception": str(exc),
+            },
             original_exception=exc
         )
\ No newline at end of file
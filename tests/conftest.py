@@ -0,0 +1,111 @@
+"""Shared pytest configuration for the Python test suite."""
+import os
+import sys
+import types
+from contextlib import asynccontextmanager
+
+import pytest
+
+
+class _StubSentenceTransformer:
+    """Stand-in for ``SentenceTransformer`` that skips model download and load."""
+
+    def __init__(self, model_name_or_path=None, *args, **kwargs):
+        self.model_name_or_path = model_name_or_path
+
+    def encode(self, sentences, *args, **kwargs):
+        raise RuntimeError("Stub SentenceTransformer cannot encode; mock encode() in the test")
+
+
+# Installed before any test module imports services.embedding_service, so
+# EmbeddingService() never loads the real model during collection.
+_sentence_transformers_stub = types.ModuleType("sentence_transformers")
+_sentence_transformers_stub.SentenceTransformer = _StubSentenceTransformer
+sys.modules["sentence_transformers"] = _sentence_transformers_stub
+
+
+class MockLLMClient:
+    """LLM client double whose ``invoke`` returns the preset ``response``."""
+
+    def __init__(self, response: str = ""):
+        self.response = response
+        self.prompts = []
+
+    async def invoke(self, prompt: str, *args, **kwargs) -> str:
+        self.prompts.append(prompt)
+        return self.response
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One ``TestClient`` (and one ASGI lifespan) shared by the whole session."""
+    from fastapi.testclient import TestClient
+
+    from server import app
+
+    headers = {"X-API-Key": os.environ["API_KEY"]} if "API_KEY" in os.environ else {}
+    with TestClient(app, headers=headers) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def mock_llm_client(monkeypatch):
+    """Route every ``LLMClient()`` built by the MCP endpoint to a ``MockLLMClient``."""
+    mock_client = MockLLMClient()
+    monkeypatch.setattr("routes.mcp.LLMClient", lambda *args, **kwargs: mock_client)
+    return mock_client
+
+
+class _ConnectedBackend:
+    """Connected database double that answers every health-check ping."""
+
+    async def verify_connectivity(self):
+        return None
+
+    def get_server_version(self):
+        return "test"
+
+    def cursor(self):
+        return self
+
+    def execute(self, *args):
+        return self
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        return None
+
+
+# Shared by every backend slot; the doubles hold no state.
+_CONNECTED = _ConnectedBackend()
+
+
+@pytest.fixture
+def db_mocks(monkeypatch):
+    """Install connected database doubles for the health and retrieve routes.
+
+    Set ``db_mocks.milvus``/``neo4j``/``sql`` to ``None`` inline to simulate a
+    disconnected backend; the patched getters read them at call time.
+    """
+    mocks = types.SimpleNamespace(milvus=_CONNECTED, neo4j=_CONNECTED, sql=_CONNECTED)
+
+    async def get_milvus_client():
+        return mocks.milvus
+
+    async def get_neo4j_driver():
+        return mocks.neo4j
+
+    @asynccontextmanager
+    async def sql_connection():
+        yield mocks.sql
+
+    async def get_sql_server_connection():
+        return sql_connection()
+
+    monkeypatch.setattr("utils.get_shared_milvus_client", get_milvus_client)
+    monkeypatch.setattr("routes.retrieve.get_milvus_client", get_milvus_client)
+    monkeypatch.setattr("utils.get_shared_neo4j_driver", get_neo4j_driver)
+    monkeypatch.setattr("utils.get_sql_server_connection", get_sql_server_connection)
+    return mocks
@@ -7,7 +7,6 @@ from llm_connector import LLMClient
 from tests.conftest import MockLLMClient
 
 
-@pytest.mark.asyncio
 async def test_mcp_golden_path(
     client: TestClient, mock_llm_client: MockLLMClient, monkeypatch: pytest.MonkeyPatch
 ):
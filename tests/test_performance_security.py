@@ -21,9 +21,8 @@ async def test_concurrent_agent_performance():
     tool_registry = ToolRegistry()
     tool_registry.register_tool(FinishTool())
     
-    agents = []
-    for i in range(5):  # Create 5 concurrent agents
-        agent = OrchestratorAgent(
+    agents = [
+        OrchestratorAgent(
             agent_id=i,
             name=f"PerfTest_{i}",
             role="Performance Tester",
@@ -31,20 +30,21 @@ async def test_concurrent_agent_performance():
             llm_client=llm_client,
             project_state=ProjectState()
         )
-        agents.append(agent)
+        for i in range(5)  # Create 5 concurrent agents
+    ]
     
     # Performance test
     start_time = time.time()
     initial_memory = psutil.Process().memory_info().rss
     
     # Run agents concurrently
-    tasks = []
-    for i, agent in enumerate(agents):
-        task = agent.run(
+    tasks = [
+        agent.run(
             mission_prompt=f"Complete performance test {i} by finishing with result 'PERF_TEST_{i}_COMPLETE'",
             log_id=i
         )
-        tasks.append(task)
+        for i, agent in enumerate(agents)
+    ]
     
     results = await asyncio.gather(*tasks, return_exceptions=True)
     
@@ -78,15 +78,14 @@ async def test_memory_leak_detection():
     write_tool = WriteToSharedStateTool(project_state)
     read_tool = ReadFromSharedStateTool(project_state)
     
+    failures = []
     for i in range(1000):  # 1000 operations
-        # Write operation
-        result = write_tool.execute(key=f"test_key_{i}", value=f"test_value_{i}" * 100)
-        assert result.get("status") != "error", f"Write failed at iteration {i}"
-        
-        # Read operation
-        result = read_tool.execute(key=f"test_key_{i}")
-        assert result.get("status") != "error", f"Read failed at iteration {i}"
-        
+        # Write + read operation; failures are collected and asserted once below
+        write_result = write_tool.execute(key=f"test_key_{i}", value=f"test_value_{i}" * 100)
+        read_result = read_tool.execute(key=f"test_key_{i}")
+        if write_result.get("status") == "error" or read_result.get("status") == "error":
+            failures.append(i)
+
         # Periodic cleanup test
         if i % 100 == 0:
             gc.collect()
@@ -96,6 +95,8 @@ async def test_memory_leak_detection():
             # Memory should not grow unboundedly
             assert memory_growth < 100, f"Memory leak detected: {memory_growth}MB growth after {i} operations"
 
+    assert not failures, f"Shared state operations failed at iterations {failures[:10]}"
+
 
 @pytest.mark.security
 async def test_sql_injection_protection():
@@ -262,6 +263,42 @@ async def test_input_sanitization():
         assert result.get("valid") == False, f"Malicious input passed validation: {malicious}"
 
 
+@pytest.mark.security
+def test_tool_error_details_redact_and_cap_parameters():
+    """Tool error payloads never echo credentials or megabyte-sized inputs."""
+    from utils.error_handlers import ToolErrorHandler
+
+    parameters = {
+        "query": "short",
+        "limit": 5,
+        "API_KEY": "sk-secret",
+        "token": "abc",
+        "document": "x" * 1_000_000,
+        "notes": "y" * 500,
+    }
+    error = ToolErrorHandler.handle_tool_error(RuntimeError("boom"), "rag", parameters)
+    sanitized = error.to_dict()["details"]["parameters"]
+
+    assert sanitized["query"] == "short" and sanitized["limit"] == 5
+    assert sanitized["API_KEY"] == sanitized["token"] == "***"
+    assert sanitized["document"] == "<redacted 1000002 bytes>"
+    assert sanitized["notes"].endswith("…<truncated>") and len(sanitized["notes"]) < 300
+    assert parameters["token"] == "abc"
+
+
+@pytest.mark.security
+def test_find_error_message_terminates_on_cyclic_chain():
+    """A self-referencing cause chain is walked once instead of looping forever."""
+    from utils.error_handlers import find_error_message
+
+    outer = RuntimeError("wrapper")
+    inner = ValueError("Failed to connect to Milvus.")
+    outer.__cause__, inner.__context__ = inner, outer
+
+    assert find_error_message(outer, "Failed to connect to Milvus.")
+    assert not find_error_message(outer, "Failed to generate query embedding.")
+
+
 @pytest.mark.performance
 async def test_response_time_requirements():
     """Test response time requirements for critical operations."""
@@ -1,71 +1,220 @@
+import asyncio
+import sys
+import numpy as np
 import pytest
+from collections import namedtuple
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import utils
+from services import rag_orchestrator
 from llm_connector import LLMClient
-from plugins import call_plugin
 from services.embedding_service import EmbeddingService
 from services.rag_orchestrator import RAGOrchestrator
-from services.unified_database_service import EnhancedUnifiedSearchService
+from services.unified_database_service import (
+    EnhancedUnifiedSearchService,
+    MilvusSearchService,
+    _milvus_filter,
+)
 from plugins_folder.tools import RAGTool, CheckForClarificationsTool, TreeOfThoughtTool
+from tree_of_thought import Thought, expand_thought_tree, prune_tree, select_best_thought
+from utils.database_interfaces import CachedVectorSearchService
+from tests.conftest import MockLLMClient
+
+# Keep this module on a single xdist worker: its session-scoped mocks are
+# shared across tests (run with ``-n auto --dist loadgroup``).
+pytestmark = [pytest.mark.unit, pytest.mark.xdist_group(name="rag_pipeline")]
+
+_Q = "test query"
+_INTEGRATION_QUERY = "integration test query"
+
+# Built once at import; immutable so tests can share them safely.
+_TEST_EMB_768 = (0.1,) * 768
+_TEST_EMB_1536 = (0.1,) * 1536
+_ORTHOGONAL_EMB_768 = (1.0,) + (0.0,) * 767
+
+
+# Default search/status payloads, built once and shared read-only by tests.
+_VECTOR_HIT = ({"text": "milvus context", "score": 0.9, "source": "milvus"},)
+_GRAPH_HIT = ({"text": "neo4j context", "score": 1.0, "source": "neo4j"},)
+_SEARCH_OK = {
+    "vector_results": _VECTOR_HIT,
+    "graph_results": _GRAPH_HIT,
+    "relational_results": (),
+    "errors": (),
+    "search_successful": True,
+    "services_attempted": ("vector", "graph"),
+}
+_SERVICE_STATUS_OK = {
+    "vector": {"healthy": True},
+    "graph": {"healthy": True},
+    "relational": {"healthy": True},
+}
+
+
+# --- Stubs ---
+
+
+class StubLLM:
+    """Stub-only LLM client exposing just ``invoke`` (no spec introspection).
+
+    ``__slots__`` gives spec_set-style protection, here and on the stubs
+    below: assigning a misspelled attribute raises AttributeError instead of
+    silently creating a new mock.
+    """
+
+    __slots__ = ("invoke",)
+
+    def __init__(self):
+        self.invoke = AsyncMock(return_value="Mocked LLM response")
+
+
+class StubEmbed:
+    """Stub-only embedding service exposing just ``get_embedding``."""
+
+    __slots__ = ("get_embedding",)
+
+    def __init__(self):
+        self.get_embedding = AsyncMock(return_value=[0.1, 0.2, 0.3])
+
+
+class StubDB:
+    """Stub-only unified DB service exposing ``search_all``/``get_service_status``."""
+
+    __slots__ = ("search_all", "get_service_status")
+
+    def __init__(self):
+        self.search_all = AsyncMock()
+        self.get_service_status = AsyncMock()
+
+
+# What SentenceTransformer.encode really returns: a float32 ndarray.
+_FAKE_EMB = np.array([0.1, 0.2, 0.3], dtype=np.float32)
+
+
+def _fake_batch_encode(texts):
+    """Batched ``encode``: one ``_FAKE_EMB`` row per input text."""
+    return np.tile(_FAKE_EMB, (len(texts), 1))
+
+
+# Plain record for Milvus search hits; avoids MagicMock attribute machinery.
+MilvusHit = namedtuple("MilvusHit", "id distance entity")
+
+
+class StubMilvusClient:
+    """Minimal Milvus client returning preset search hits."""
+
+    def __init__(self, hits):
+        self.hits = hits
+
+    def search(self, **kwargs):
+        return self.hits
 
 
 # --- Fixtures ---
+#
+# Mocks are created once per session and reset per test.
+
+
+@pytest.fixture(scope="session")
+def _llm_client_session_mock():
+    return StubLLM()
+
+
+@pytest.fixture(scope="session")
+def _embedding_service_session_mock():
+    return StubEmbed()
+
+
+@pytest.fixture(scope="session")
+def _unified_db_service_session_mock():
+    return StubDB()
 
 
 @pytest.fixture
-def mock_llm_client():
+def mock_llm_client(_llm_client_session_mock):
     """Mock LLM client for testing."""
-    mock_client = AsyncMock(spec=LLMClient)
+    mock_client = _llm_client_session_mock
+    mock_client.invoke.reset_mock(return_value=True, side_effect=True)
     mock_client.invoke.return_value = "Mocked LLM response"
     return mock_client
 
 
 @pytest.fixture
-def mock_embedding_service():
+def mock_embedding_service(_embedding_service_session_mock):
     """Mock embedding service for testing."""
-    mock_service = AsyncMock(spec=EmbeddingService)
+    mock_service = _embedding_service_session_mock
+    mock_service.get_embedding.reset_mock(return_value=True, side_effect=True)
     mock_service.get_embedding.return_value = [0.1, 0.2, 0.3]
     return mock_service
 
 
 @pytest.fixture
-def mock_unified_db_service():
+def mock_unified_db_service(_unified_db_service_session_mock):
     """Mock unified database service for testing."""
-    mock_service = AsyncMock(spec=EnhancedUnifiedSearchService)
-    mock_service.search_all.return_value = {
-        "vector_results": [{"text": "milvus context", "score": 0.9, "source": "milvus"}],
-        "graph_results": [{"text": "neo4j context", "score": 1.0, "source": "neo4j"}],
-        "relational_results": [],
-        "errors": [],
-        "search_successful": True,
-        "services_attempted": ["vector", "graph"]
-    }
-    mock_service.get_service_status.return_value = {
-        "vector": {"healthy": True},
-        "graph": {"healthy": True},
-        "relational": {"healthy": True}
-    }
+    mock_service = _unified_db_service_session_mock
+    mock_service.search_all.reset_mock(return_value=True, side_effect=True)
+    mock_service.get_service_status.reset_mock(return_value=True, side_effect=True)
+    mock_service.search_all.return_value = _SEARCH_OK
+    mock_service.get_service_status.return_value = _SERVICE_STATUS_OK
     return mock_service
 
 
+@pytest.fixture(scope="session")
+def milvus_hits():
+    """Immutable Milvus search payload shared by every test that needs one."""
+    return (
+        (
+            MilvusHit("milvus_id_1", 0.1, {"document_id": "doc1", "text": "Milvus Text 1"}),
+            MilvusHit("milvus_id_2", 0.2, {"document_id": "doc2", "text": "Milvus Text 2"}),
+        ),
+    )
+
+
+@pytest.fixture(scope="module")
+def _patched_call_plugin(request):
+    """Patch the orchestrator's plugin hook once for the whole module."""
+    patcher = patch.object(rag_orchestrator, "call_plugin", new_callable=AsyncMock)
+    mock_plugin = patcher.start()
+    request.addfinalizer(patcher.stop)
+    return mock_plugin
+
+
+@pytest.fixture
+def mock_call_plugin(_patched_call_plugin):
+    """Module-wide ``call_plugin`` patch, reset for each test."""
+    _patched_call_plugin.reset_mock(return_value=True, side_effect=True)
+    return _patched_call_plugin
+
+
+@pytest.mark.parametrize(
+    "stub,real",
+    [
+        (StubLLM, LLMClient),
+        (StubEmbed, EmbeddingService),
+        (StubDB, EnhancedUnifiedSearchService),
+    ],
+)
+def test_stubs_match_real_interfaces(stub, real):
+    """Guard against stub drift: every stubbed attribute must exist on the real class."""
+    missing = [name for name in stub.__slots__ if not callable(getattr(real, name, None))]
+    assert not missing, f"{stub.__name__} stubs methods missing from {real.__name__}: {missing}"
+
+
 # --- Tests for EmbeddingService ---
 
 
-@pytest.mark.asyncio
 async def test_embedding_service_get_embedding_success():
     """Test successful embedding generation."""
     service = EmbeddingService()
     service.embedding_model = MagicMock()
-    service.embedding_model.encode.return_value = MagicMock(
-        tolist=lambda: [0.1, 0.2, 0.3]
-    )
+    service.embedding_model.encode.side_effect = _fake_batch_encode
 
     embedding = await service.get_embedding("test text")
-    assert embedding == [0.1, 0.2, 0.3]
-    service.embedding_model.encode.assert_called_once_with("test text")
+    assert embedding == _FAKE_EMB.tolist()
+    service.embedding_model.encode.assert_called_once_with(["test text"])
 
 
-@pytest.mark.asyncio
 async def test_embedding_service_get_embedding_no_model():
     """Test embedding generation when no model is loaded."""
     service = EmbeddingService()
@@ -75,38 +224,328 @@ async def test_embedding_service_get_embedding_no_model():
     assert embedding is None
 
 
+async def test_get_embedding_is_cached():
+    """Test repeat queries are served from the cache without re-encoding."""
+    service = EmbeddingService()
+    service.embedding_model = MagicMock(encode=MagicMock(side_effect=_fake_batch_encode))
+
+    first = await service.get_embedding("foo")
+    second = await service.get_embedding("  foo ")
+
+    assert first == second == _FAKE_EMB.tolist()
+    assert service.embedding_model.encode.call_count == 1
+
+
+async def test_embedding_service_batch_encode():
+    """Test concurrent queries are coalesced into a single batched encode call."""
+    service = EmbeddingService()
+    service.embedding_model = MagicMock(encode=MagicMock(side_effect=_fake_batch_encode))
+
+    embeddings = await asyncio.gather(
+        *(service.get_embedding(f"q{i}") for i in range(32))
+    )
+
+    service.embedding_model.encode.assert_called_once()
+    (batch,), _ = service.embedding_model.encode.call_args
+    assert list(batch) == [f"q{i}" for i in range(32)]
+    assert embeddings == [_FAKE_EMB.tolist()] * 32
+
+
+async def test_embedding_service_lone_query_skips_batch_window():
+    """Test a query with no encode running is dispatched without the window."""
+    service = EmbeddingService(batch_window=10)
+    service.embedding_model = MagicMock(encode=MagicMock(side_effect=_fake_batch_encode))
+
+    embedding = await asyncio.wait_for(service.get_embedding("q"), 1)
+
+    assert embedding == _FAKE_EMB.tolist()
+
+
+async def test_embedding_service_cancelled_flusher_still_resolves_batch():
+    """Test cancelling the caller that fills the batch does not strand the others."""
+    service = EmbeddingService(batch_window=0.05, max_batch_size=4)
+    service.embedding_model = MagicMock(encode=MagicMock(side_effect=_fake_batch_encode))
+
+    tasks = [asyncio.create_task(service.get_embedding(f"q{i}")) for i in range(4)]
+    await asyncio.sleep(0)
+    flusher = tasks.pop()
+    flusher.cancel()
+
+    others = asyncio.gather(*tasks)
+    assert await asyncio.wait_for(others, 1) == [_FAKE_EMB.tolist()] * 3
+    service.embedding_model.encode.assert_called_once()
+    with pytest.raises(asyncio.CancelledError):
+        await flusher
+
+
 # --- Tests for Database Services ---
 
 
-@pytest.mark.asyncio
-async def test_unified_db_service_search_success():
+@pytest.mark.parametrize(
+    "embedding", [_TEST_EMB_768, _TEST_EMB_1536], ids=["dim768", "dim1536"]
+)
+async def test_unified_db_service_search_success(embedding):
     """Test successful unified database service search."""
     mock_service = EnhancedUnifiedSearchService()
+    # Spies only: search_all must not probe health before searching
+    vector_health = AsyncMock()
+    graph_health = AsyncMock()
     
-    with patch.object(mock_service.vector_service, 'search_by_vector') as mock_vector, \
-         patch.object(mock_service.graph_service, 'search_nodes') as mock_graph, \
-         patch.object(mock_service.vector_service, 'is_healthy') as mock_vector_health, \
-         patch.object(mock_service.graph_service, 'is_healthy') as mock_graph_health:
-        
-        mock_vector_health.return_value = True
-        mock_graph_health.return_value = True
-        mock_vector.return_value = [{"text": "vector result", "score": 0.9, "source": "milvus"}]
-        mock_graph.return_value = [{"text": "graph result", "source": "neo4j"}]
-        
+    with patch.multiple(
+        mock_service.vector_service,
+        is_healthy=vector_health,
+        search_by_vector=AsyncMock(
+            return_value=({"text": "vector result", "score": 0.9, "source": "milvus"},)
+        ),
+    ), patch.multiple(
+        mock_service.graph_service,
+        is_healthy=graph_health,
+        search_nodes=AsyncMock(return_value=({"text": "graph result", "source": "neo4j"},)),
+    ):
         results = await mock_service.search_all(
-            query="test query",
-            embedding=[0.1] * 1536
+            query=_Q,
+            embedding=embedding
         )
         
         assert results["search_successful"] is True
         assert len(results["vector_results"]) == 1
         assert len(results["graph_results"]) == 1
+        vector_health.assert_not_called()
+        graph_health.assert_not_called()
+
+
+async def test_unified_db_service_search_isolates_backend_failure():
+    """Test a failing backend is reported without blocking the other's results."""
+    service = EnhancedUnifiedSearchService()
+    vector_health = AsyncMock(return_value=True)
+
+    with patch.multiple(
+        service.vector_service,
+        is_healthy=vector_health,
+        search_by_vector=AsyncMock(return_value=[{"text": "vector result"}]),
+    ), patch.multiple(
+        service.graph_service,
+        search_nodes=AsyncMock(side_effect=ConnectionError("neo4j down")),
+    ):
+        results = await service.search_all(query=_Q, embedding=_TEST_EMB_768)
+
+    assert results["vector_results"] == [{"text": "vector result"}]
+    assert results["graph_results"] == []
+    assert [e["details"]["database_type"] for e in results["errors"]] == ["graph"]
+    assert results["services_succeeded"] == 1
+    vector_health.assert_not_awaited()
+
+
+async def test_unified_db_service_search_cancels_backend_past_deadline(monkeypatch):
+    """Test a hung backend is cancelled at the deadline and the other's results kept."""
+    monkeypatch.setattr("utils.database_interfaces.SEARCH_TIMEOUT", 0.05)
+    service = EnhancedUnifiedSearchService()
+    hung = asyncio.Event()
+
+    async def never_returns(*args, **kwargs):
+        await hung.wait()
+
+    with patch.object(service.vector_service, "search_by_vector", never_returns), \
+         patch.object(service.graph_service, "search_nodes", AsyncMock(return_value=[{"text": "g"}])):
+        results = await service.search_all(query=_Q, embedding=_TEST_EMB_768)
+
+    assert results["graph_results"] == [{"text": "g"}]
+    assert [e["details"]["database_type"] for e in results["errors"]] == ["vector"]
+
+
+async def test_unified_db_service_status_reports_failed_probe():
+    """Test health probes run together and a raising probe marks only its backend."""
+    service = EnhancedUnifiedSearchService()
+
+    with patch.object(service.vector_service, "is_healthy", AsyncMock(return_value=True)), \
+         patch.object(service.graph_service, "is_healthy", AsyncMock(side_effect=ConnectionError("down"))), \
+         patch.object(service.relational_service, "is_healthy", AsyncMock(return_value=False)):
+        health = await service.health_check()
+        status = await service.get_service_status()
+
+    assert health == {"vector": True, "graph": False, "relational": False}
+    assert status["vector"]["healthy"] is True
+    assert status["graph"] == {
+        "healthy": False,
+        "name": service.graph_service.name,
+        "type": "Neo4jSearchService",
+        "error": "down",
+    }
+    assert "error" not in status["relational"]
+
+
+async def test_unified_db_service_caches_health_until_a_query_fails():
+    """Test repeated health checks reuse one probe until a search fails."""
+    service = EnhancedUnifiedSearchService()
+    graph_health = AsyncMock(return_value=True)
+
+    with patch.object(service.graph_service, "is_healthy", graph_health), \
+         patch.object(service.graph_service, "search_nodes", AsyncMock(side_effect=ConnectionError("down"))), \
+         patch.object(service.vector_service, "is_healthy", AsyncMock(return_value=True)), \
+         patch.object(service.relational_service, "is_healthy", AsyncMock(return_value=True)):
+        await asyncio.gather(service.health_check(), service.health_check())
+        await service.get_service_status()
+        assert graph_health.await_count == 1
+
+        await service.search_all(query=_Q, include_vector=False)
+        await service.health_check()
+        assert graph_health.await_count == 2
+
+
+async def test_cached_vector_search_reuses_results_per_embedding():
+    """Test equivalent embeddings and filters share an entry and inserts invalidate it."""
+    inner = MilvusSearchService()
+    hits = [{"id": "milvus_id_1", "text": "cached"}]
+    with patch.multiple(
+        inner,
+        search_by_vector=AsyncMock(return_value=hits),
+        insert_vectors=AsyncMock(return_value=True),
+    ):
+        service = CachedVectorSearchService(inner)
+        assert await service.search_by_vector(_TEST_EMB_768, "docs") == hits
+        assert await service.search_by_vector(np.asarray(_TEST_EMB_768), "docs") == hits
+        await service.search_by_vector(_TEST_EMB_768, "docs", limit=10)
+        await service.search_by_vector(_TEST_EMB_768, "docs", filters={"a": 1, "b": [2]})
+        await service.search_by_vector(_TEST_EMB_768, "docs", filters={"b": [2], "a": 1})
+        await service.insert_vectors("docs", [])
+        await service.search_by_vector(_TEST_EMB_768, "docs")
+
+        assert inner.search_by_vector.await_count == 4
+    stats = service.stats()
+    assert stats["hits"] == 2
+    with pytest.raises(TypeError):
+        stats["hits"] = 0
+
+
+async def test_cached_vector_search_coalesces_concurrent_misses():
+    """Test identical concurrent searches share a single backend request."""
+    inner = MilvusSearchService()
+    release = asyncio.Event()
+
+    async def slow_search(*args, **kwargs):
+        await release.wait()
+        return [{"id": "a"}]
+
+    with patch.object(inner, "search_by_vector", AsyncMock(side_effect=slow_search)):
+        service = CachedVectorSearchService(inner)
+        searches = asyncio.gather(
+            *(service.search_by_vector(_TEST_EMB_768, "docs") for _ in range(5))
+        )
+        await asyncio.sleep(0)
+        release.set()
+        assert await searches == [[{"id": "a"}]] * 5
+        assert inner.search_by_vector.await_count == 1
+    assert service.stats()["coalesced"] == 4
+
+
+async def test_cached_vector_search_serves_near_duplicate_embeddings():
+    """Test a near-identical embedding reuses results and a distant one does not."""
+    inner = MilvusSearchService()
+    with patch.object(inner, "search_by_vector", AsyncMock(return_value=[{"id": "a"}])):
+        service = CachedVectorSearchService(inner)
+        await service.search_by_vector(_TEST_EMB_768, "docs")
+        assert await service.search_by_vector(_TEST_EMB_768[:-1] + (0.11,), "docs") == [{"id": "a"}]
+        await service.search_by_vector(_ORTHOGONAL_EMB_768, "docs")
+
+        assert inner.search_by_vector.await_count == 2
+    assert service.stats()["semantic_hits"] == 1
+
+
+async def test_cached_vector_search_bounds_semantic_rings():
+    """Test rings are capped per scope count and allocate rows only as they fill."""
+    inner = MilvusSearchService()
+    with patch.object(inner, "search_by_vector", AsyncMock(return_value=[{"id": "a"}])):
+        service = CachedVectorSearchService(inner, semantic_scopes=2)
+        for limit in (1, 2, 3):
+            await service.search_by_vector(_TEST_EMB_768, "docs", limit=limit)
+
+    assert [scope[1] for scope in service._rings] == [2, 3]
+    assert all(ring.matrix.shape[0] < service.semantic_slots for ring in service._rings.values())
+
+
+async def test_cached_vector_search_expires_results_after_ttl():
+    """Test expired results are fetched again, for exact and near-duplicate queries."""
+    inner = MilvusSearchService()
+    with patch.object(inner, "search_by_vector", AsyncMock(return_value=[{"id": "a"}])):
+        service = CachedVectorSearchService(inner, ttl=0)
+        await service.search_by_vector(_TEST_EMB_768, "docs")
+        await service.search_by_vector(_TEST_EMB_768, "docs")
+        await service.search_by_vector(_TEST_EMB_768[:-1] + (0.11,), "docs")
+
+        assert inner.search_by_vector.await_count == 3
+    assert service.stats()["hits"] == service.stats()["semantic_hits"] == 0
+
+
+async def test_unified_db_service_search_all_batch_issues_one_call_per_backend():
+    """Test a batch of queries reaches each backend once and is split back per query."""
+    service = EnhancedUnifiedSearchService()
+    inner = MilvusSearchService()
+    vector_batch = AsyncMock(return_value=[[{"text": "v1"}], [{"text": "v3"}]])
+    graph_batch = AsyncMock(side_effect=[[[{"text": "g1"}], [], [{"text": "g3"}]], [[]]])
+    service.vector_service = CachedVectorSearchService(inner)
+
+    with patch.object(inner, "search_by_vectors", vector_batch), \
+         patch.object(service.graph_service, "search_nodes_batch", graph_batch):
+        first = await service.search_all_batch(
+            [("q1", _TEST_EMB_768), ("q2", None), ("q3", _ORTHOGONAL_EMB_768)]
+        )
+        again = await service.search_all_batch([("q3", _ORTHOGONAL_EMB_768)])
+
+    assert [r["vector_results"] for r in first] == [[{"text": "v1"}], [], [{"text": "v3"}]]
+    assert [r["graph_results"] for r in first] == [[{"text": "g1"}], [], [{"text": "g3"}]]
+    assert again[0]["vector_results"] == [{"text": "v3"}]
+    vector_batch.assert_awaited_once()
+    assert len(vector_batch.await_args.args[0]) == 2
+    assert vector_batch.await_args.args[1] == "default_collection"
+
+
+async def test_milvus_search_by_vector_formats_hits(monkeypatch, milvus_hits):
+    """Test Milvus hits are flattened into scored result dicts."""
+
+    @asynccontextmanager
+    async def milvus_context():
+        yield StubMilvusClient(milvus_hits)
+
+    monkeypatch.setattr(utils, "milvus_connection_context", milvus_context)
+
+    results = await MilvusSearchService().search_by_vector(
+        _TEST_EMB_1536, collection="test_collection"
+    )
+
+    assert [r["id"] for r in results] == ["milvus_id_1", "milvus_id_2"]
+    assert [r["document_id"] for r in results] == ["doc1", "doc2"]
+    assert results[0]["text"] == "Milvus Text 1"
+    assert results[0]["score"] == pytest.approx(0.9)
+    assert all(r["source"] == "milvus" for r in results)
+
+
+@pytest.mark.parametrize(
+    "filters,expression",
+    [
+        (None, ""),
+        ({"lang": "en", "year": [2023, 2024], "draft": None}, 'lang == "en" and year in [2023, 2024]'),
+    ],
+    ids=["none", "scalar_and_list"],
+)
+def test_milvus_filter_builds_expression(filters, expression):
+    """Test filters become equality and ``in`` clauses in a stable field order."""
+    assert _milvus_filter(filters) == expression
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [{"lang == 'en' or 1": 1}, {"meta": {"lang": "en"}}, {"tags": [["a"]]}, {"ids": {1, 2}}],
+    ids=["injected_field", "nested_dict", "nested_list", "set_value"],
+)
+def test_milvus_filter_rejects_inexpressible_filters(filters):
+    """Test unsafe field names and values without a flat Milvus form raise."""
+    with pytest.raises(ValueError):
+        _milvus_filter(filters)
 
 
 # --- Tests for Enhanced Tools ---
 
 
-@pytest.mark.asyncio
 async def test_rag_tool_execution():
     """Test RAG tool execution with mocked orchestrator."""
     mock_orchestrator = AsyncMock()
@@ -123,16 +562,49 @@ async def test_rag_tool_execution():
     mock_orchestrator.generate_response.assert_called_once()
 
 
-@pytest.mark.asyncio
+# Scripted LLM replies for one tree-of-thought expansion, consumed in order.
+_TOT_LLM_RESPONSES = (
+    '["Approach 1", "Approach 2", "Approach 3"]',  # Generation response
+    '0.8',  # Evaluation for first approach
+    '0.6',  # Evaluation for second approach
+    '0.9',  # Evaluation for third approach
+)
+
+
+async def test_expand_thought_tree_treats_object_reply_as_one_thought():
+    """Test a JSON object reply becomes a single child rather than one per key."""
+    root = Thought("root")
+    llm = MockLLMClient(response='{"text": "only idea", "score": 0.8}')
+
+    await expand_thought_tree(root, llm)
+
+    assert [(child.text, child.score) for child in root.children] == [("only idea", 0.8)]
+
+
+async def test_expand_thought_tree_stringifies_non_text_thoughts():
+    """Test numeric thoughts become text instead of breaking prompt assembly."""
+    root = Thought("root")
+    llm = MockLLMClient(response='[1, {"text": 5}]')
+
+    await expand_thought_tree(root, llm)
+
+    assert [child.text for child in root.children] == ["1", "5"]
+
+
+async def test_expand_thought_tree_formats_non_text_root():
+    """Test a non-string root query is formatted into the generation prompt."""
+    root = Thought(42)
+    llm = MockLLMClient(response='[{"text": "child", "score": 0.5}]')
+
+    await expand_thought_tree(root, llm)
+
+    assert [child.text for child in root.children] == ["child"]
+
+
 async def test_tree_of_thought_tool_execution():
     """Test Tree of Thought tool execution."""
     mock_llm = AsyncMock()
-    mock_llm.invoke.side_effect = [
-        '["Approach 1", "Approach 2", "Approach 3"]',  # Generation response
-        '0.8',  # Evaluation for first approach
-        '0.6',  # Evaluation for second approach
-        '0.9',  # Evaluation for third approach
-    ]
+    mock_llm.invoke.side_effect = iter(_TOT_LLM_RESPONSES)
     
     tot_tool = TreeOfThoughtTool(mock_llm)
     result = await tot_tool.execute(prompt="How to solve climate change?")
@@ -143,57 +615,164 @@ async def test_tree_of_thought_tool_execution():
     assert len(result["data"]["thoughts"]) == 3
 
 
-@pytest.mark.asyncio
-async def test_clarification_tool_execution():
-    """Test clarification checking tool."""
-    clarification_tool = CheckForClarificationsTool()
-    
-    # Test query that needs clarification
-    result = clarification_tool.execute(query="Help me")
-    assert result["status"] == "success"
-    assert result["data"]["needs_clarification"] is True
-    
-    # Test query that doesn't need clarification
-    result = clarification_tool.execute(query="What is the capital of France and when was it founded?")
-    assert result["status"] == "success"
-    assert result["data"]["needs_clarification"] is False
+async def test_tree_of_thought_execute_many_batches_per_level():
+    """Test execute_many issues one batched LLM call per tree level."""
+    mock_llm = AsyncMock()
+    mock_llm.invoke_batch.side_effect = [
+        ['["A1", "A2"]', '["B1", "B2"]'],  # Generation, one reply per prompt
+        ["0.2", "0.9", "0.7", "0.4"],  # Evaluation, one reply per thought
+    ]
 
+    results = await TreeOfThoughtTool(mock_llm).execute_many(
+        ["First problem prompt", "Second problem prompt"], branches=2
+    )
 
+    assert mock_llm.invoke_batch.await_count == 2
+    mock_llm.invoke.assert_not_called()
+    assert [r["data"]["best_thought"]["text"] for r in results] == ["A2", "B1"]
+
+
+def test_prune_tree_deeper_than_recursion_limit():
+    """Test prune_tree walks chains deeper than the interpreter recursion limit."""
+    root = node = Thought("root", score=1.0)
+    for i in range(sys.getrecursionlimit() + 100):
+        child = Thought(f"step {i}", score=1.0)
+        node.add_child(child)
+        node.add_child(Thought(f"weak {i}", score=-1.0))
+        node = child
+
+    prune_tree(root, min_score=0)
+
+    depth = 0
+    while root.children:
+        assert [c.score for c in root.children] == [1.0]
+        root = root.children[0]
+        depth += 1
+    assert depth == sys.getrecursionlimit() + 100
+
+
+def test_thought_to_dict_deep_chain_and_invalidation():
+    """Test to_dict serializes deep chains and refreshes after add_child."""
+    root = node = Thought("root")
+    for i in range(sys.getrecursionlimit() + 100):
+        child = Thought(f"step {i}")
+        node.add_child(child)
+        node = child
+
+    first = root.to_dict()
+    assert root.to_dict() is first
+    node.add_child(Thought("leaf", score=0.5))
+
+    tree = root.to_dict()
+    assert tree is not first
+    while tree["children"]:
+        tree = tree["children"][0]
+    assert tree == {"text": "leaf", "score": 0.5, "children": []}
+
+
+def test_select_best_thought_finds_deep_best_past_dominated_branches():
+    """Test subtree_max pruning still returns the highest-scored node."""
+    root = Thought("root", score=0.1)
+    strong, weak = Thought("strong", score=0.8), Thought("weak", score=0.2)
+    root.add_child(weak)
+    root.add_child(strong)
+    weak.add_child(Thought("weak leaf", score=0.3))
+    deep = Thought("deep", score=0.95)
+    strong.add_child(Thought("middle", score=0.5))
+    strong.children[0].add_child(deep)
+
+    assert root.subtree_max == 0.95
+    assert weak.subtree_max == 0.3
+    assert select_best_thought(root) is deep
+
+
+# Stateless, so one instance serves every parametrized case.
+_CLARIFICATION_TOOL = CheckForClarificationsTool()
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        pytest.param("Help me", True, id="needs-clarification"),
+        pytest.param(
+            "What is the capital of France and when was it founded?", False, id="clear"
+        ),
+    ],
+)
+def test_clarification_tool_execution(query, expected):
+    """Test clarification checking tool."""
+    result = _CLARIFICATION_TOOL.execute(query=query)
+    assert result["status"] == "success"
+    assert result["data"]["needs_clarification"] is expected
 
 
 # --- Tests for RAGOrchestrator ---
 
 
-@pytest.mark.asyncio
+_INTEGRATION_SEARCH = {
+    "vector_results": [{"text": "integration vector context", "score": 0.9, "source": "milvus"}],
+    "graph_results": [{"text": "integration graph context", "source": "neo4j"}],
+    "relational_results": [],
+    "errors": [],
+    "search_successful": True,
+    "services_attempted": ["vector", "graph"],
+    "total_results": 2
+}
+
+
+@pytest.mark.parametrize(
+    "query,llm_response,search_payload",
+    [
+        pytest.param(
+            "What is the capital of France?", "Mocked LLM response", None,
+            id="orchestrator",
+        ),
+        pytest.param(
+            _INTEGRATION_QUERY, "Integration test response", _INTEGRATION_SEARCH,
+            id="integration", marks=pytest.mark.integration,
+        ),
+    ],
+)
 async def test_rag_orchestrator_generate_response_success(
-    mock_llm_client, mock_embedding_service, mock_unified_db_service
+    mock_llm_client, mock_embedding_service, mock_unified_db_service, mock_call_plugin,
+    query, llm_response, search_payload
 ):
     """Test successful RAG response generation with unified service."""
-    with patch('plugins.call_plugin', new_callable=AsyncMock) as mock_plugin:
-        mock_plugin.return_value = {"plugin": "result"}
-        
-        orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db_service)
-        response = await orchestrator.generate_response("What is the capital of France?")
+    mock_llm_client.invoke.return_value = llm_response
+    if search_payload is not None:
+        mock_unified_db_service.search_all.return_value = search_payload
+    mock_call_plugin.return_value = {"plugin": "result"}
+
+    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db_service)
+    response = await orchestrator.generate_response(query)
 
-        # Verify response structure
-        assert "final_response" in response
-        assert response["final_response"] == "Mocked LLM response"
-        assert "search_results" in response
-        assert "context_used" in response
-        assert response["success"] is True
+    # Verify response structure
+    assert "final_response" in response
+    assert response["final_response"] == llm_response
+    assert "search_results" in response
+    assert "context_used" in response
+    assert "services_used" in response
+    assert response["success"] is True
 
-        # Verify that services were called
-        mock_embedding_service.get_embedding.assert_called_once()
-        mock_llm_client.invoke.assert_called_once()
-        mock_unified_db_service.search_all.assert_called_once()
+    # Verify that services were called
+    mock_embedding_service.get_embedding.assert_called_once_with(query)
+    mock_llm_client.invoke.assert_called_once()
+    mock_unified_db_service.search_all.assert_called_once()
 
 
-@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "embedding_failure",
+    [
+        {"return_value": None},
+        {"side_effect": Exception("Embedding service down")},
+    ],
+    ids=["no_embedding", "embedding_exception"],
+)
 async def test_rag_orchestrator_generate_response_embedding_failure(
-    mock_llm_client, mock_embedding_service, mock_unified_db_service
+    mock_llm_client, mock_embedding_service, mock_unified_db_service, embedding_failure
 ):
     """Test RAG response when embedding generation fails but graph search succeeds."""
-    mock_embedding_service.get_embedding.return_value = None
+    mock_embedding_service.get_embedding.configure_mock(**embedding_failure)
     # Mock successful graph search even without embedding
     mock_unified_db_service.search_all.return_value = {
         "vector_results": [],
@@ -205,21 +784,19 @@ async def test_rag_orchestrator_generate_response_embedding_failure(
     }
 
     orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db_service)
-    response = await orchestrator.generate_response("test query")
+    response = await orchestrator.generate_response(_Q)
 
     # Should still succeed with graph results
     assert "final_response" in response
     assert response["success"] is True
 
 
-@pytest.mark.asyncio
 async def test_rag_orchestrator_generate_response_all_db_unavailable(
-    mock_llm_client, mock_embedding_service
+    mock_llm_client, mock_embedding_service, mock_unified_db_service
 ):
     """Test RAG response when all databases are unavailable."""
-    # Mock failed unified database service
-    mock_failed_db_service = AsyncMock()
-    mock_failed_db_service.search_all.return_value = {
+    # Reuse the shared database mock, configured to fail every search
+    mock_unified_db_service.search_all.return_value = {
         "vector_results": [],
         "graph_results": [],
         "relational_results": [],
@@ -228,73 +805,100 @@ async def test_rag_orchestrator_generate_response_all_db_unavailable(
         "services_attempted": ["vector", "graph"]
     }
 
-    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_failed_db_service)
-    response = await orchestrator.generate_response("test query")
+    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db_service)
+    response = await orchestrator.generate_response(_Q)
 
     assert "final_response" in response
     assert response["success"] is False
     assert "No database searches succeeded" in response["final_response"]
 
 
-# --- Integration Tests ---
+async def test_rag_orchestrator_answer_cache(
+    mock_llm_client, mock_embedding_service, mock_unified_db_service, mock_call_plugin
+):
+    """Test a repeated query is answered from the cache without search or LLM calls."""
+    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db_service)
 
+    first = await orchestrator.generate_response("Same query?")
+    second = await orchestrator.generate_response("  same   QUERY? ")
+    second["search_results"]["errors"] = ["changed by caller"]
+    third = await orchestrator.generate_response("same query?")
+
+    assert first["success"] is True
+    assert second["final_response"] == third["final_response"] == first["final_response"]
+    assert third["search_results"]["errors"] == ()
+    assert mock_unified_db_service.search_all.call_count == 1
+    assert mock_llm_client.invoke.call_count == 1
+    assert mock_call_plugin.await_count == 3
+
+
+@pytest.mark.parametrize(
+    "first_query,second_query",
+    [("what is 2+2", "what is 2-2"), ("Is C++ faster than C?", "Is C faster than C#?"), ("x > 5?", "x < 5?")],
+    ids=["operators", "language_names", "comparisons"],
+)
+async def test_rag_orchestrator_answer_cache_keeps_symbols(
+    mock_llm_client, mock_embedding_service, mock_unified_db_service, mock_call_plugin,
+    first_query, second_query,
+):
+    """Test queries that differ only in symbols do not share a cached answer."""
+    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db_service)
 
-@pytest.mark.asyncio
-async def test_rag_pipeline_integration():
-    """Test the RAG pipeline integration with enhanced architecture.""" 
-    mock_embedding_service = AsyncMock()
-    mock_embedding_service.get_embedding.return_value = [0.1, 0.2, 0.3]
-    
-    mock_llm_client = AsyncMock()
-    mock_llm_client.invoke.return_value = "Integration test response"
-    
-    mock_unified_db = AsyncMock()
-    mock_unified_db.search_all.return_value = {
-        "vector_results": [{"text": "integration vector context", "score": 0.9, "source": "milvus"}],
-        "graph_results": [{"text": "integration graph context", "source": "neo4j"}],
-        "relational_results": [],
-        "errors": [],
-        "search_successful": True,
-        "services_attempted": ["vector", "graph"],
-        "total_results": 2
-    }
+    await orchestrator.generate_response(first_query)
+    await orchestrator.generate_response(second_query)
 
-    with patch('plugins.call_plugin', new_callable=AsyncMock) as mock_plugin:
-        mock_plugin.return_value = {"status": "success"}
-        
-        orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db)
-        response = await orchestrator.generate_response("integration test query")
+    assert mock_llm_client.invoke.call_count == 2
+
+
+async def test_rag_orchestrator_does_not_cache_llm_failures(
+    mock_llm_client, mock_embedding_service, mock_unified_db_service, mock_call_plugin
+):
+    """Test fallback text from a failed LLM call is not served to later queries."""
+    mock_llm_client.invoke.side_effect = [RuntimeError("LLM down"), "Error: All LLM clients failed.", "ok"]
+    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db_service)
+
+    responses = [await orchestrator.generate_response("q") for _ in range(3)]
+
+    assert responses[0]["final_response"].startswith("Error generating LLM response")
+    assert responses[2]["final_response"] == "ok"
+    assert mock_llm_client.invoke.call_count == 3
+
+
+async def test_rag_orchestrator_prompt_prefix_stable(
+    mock_llm_client, mock_embedding_service, mock_unified_db_service, mock_call_plugin
+):
+    """Test prompts for different queries over the same context share a prefix.
+
+    Instructions and context come before the question, so an LLM server's prefix
+    cache can reuse the prefill for the shared context block.
+    """
+    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db_service)
 
-        # Verify the enhanced response structure
-        assert "final_response" in response
-        assert response["final_response"] == "Integration test response"
-        assert "search_results" in response
-        assert "context_used" in response
-        assert "services_used" in response
-        assert response["success"] is True
+    await orchestrator.generate_response("q1")
+    await orchestrator.generate_response("q2")
 
-        # Verify that services were called correctly
-        mock_embedding_service.get_embedding.assert_called_once_with("integration test query")
-        mock_llm_client.invoke.assert_called_once()
-        mock_unified_db.search_all.assert_called_once()
+    prompts = [call.args[0] for call in mock_llm_client.invoke.call_args_list]
+    assert len(prompts) == 2
+    shared_len = prompts[0].index("Question:")
+    assert "milvus context" in prompts[0][:shared_len]
+    assert "neo4j context" in prompts[0][:shared_len]
+    assert prompts[0][:shared_len] == prompts[1][:shared_len]
 
 
-@pytest.mark.asyncio
-async def test_orchestrator_health_check():
+# --- Integration Tests ---
+
+
+async def test_orchestrator_health_check(
+    mock_llm_client, mock_embedding_service, mock_unified_db_service
+):
     """Test RAG orchestrator health check functionality."""
-    mock_embedding_service = AsyncMock()
-    mock_embedding_service.get_embedding.return_value = [0.1, 0.2, 0.3]
-    
-    mock_llm_client = AsyncMock()
-    
-    mock_unified_db = AsyncMock()
-    mock_unified_db.get_service_status.return_value = {
+    mock_unified_db_service.get_service_status.return_value = {
         "vector": {"healthy": True, "name": "Milvus"},
         "graph": {"healthy": True, "name": "Neo4j"},
         "relational": {"healthy": False, "error": "Connection failed"}
     }
     
-    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db)
+    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db_service)
     health = await orchestrator.get_orchestrator_health()
     
     assert "orchestrator_healthy" in health
@@ -308,7 +912,6 @@ async def test_orchestrator_health_check():
 # --- Error Handling Tests ---
 
 
-@pytest.mark.asyncio
 async def test_tool_error_handling():
     """Test enhanced tool error handling."""
     # Test RAG tool with invalid input
@@ -324,31 +927,3 @@ async def test_tool_error_handling():
     
     assert result["status"] == "error"
     assert "LLM client not available" in result["message"]
-
-
-@pytest.mark.asyncio  
-async def test_orchestrator_error_recovery():
-    """Test orchestrator error recovery mechanisms."""
-    mock_embedding_service = AsyncMock()
-    mock_embedding_service.get_embedding.side_effect = Exception("Embedding service down")
-    
-    mock_llm_client = AsyncMock()
-    mock_llm_client.invoke.return_value = "Fallback response"
-    
-    # Mock DB service to still work for graph search
-    mock_unified_db = AsyncMock()
-    mock_unified_db.search_all.return_value = {
-        "vector_results": [],
-        "graph_results": [{"text": "graph fallback", "source": "neo4j"}],
-        "relational_results": [],
-        "errors": ["Embedding generation failed"],
-        "search_successful": True,
-        "services_attempted": ["graph"]
-    }
-    
-    orchestrator = RAGOrchestrator(mock_embedding_service, mock_llm_client, mock_unified_db)
-    
-    # Should still generate response using graph results
-    response = await orchestrator.generate_response("test query")
-    assert response["success"] is True
-    assert "final_response" in response
\ No newline at end of file
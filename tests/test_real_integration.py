@@ -5,56 +5,62 @@ import tempfile
 import os
 from pathlib import Path
 
+import numpy as np
+
+# These share real databases, the filesystem and process RSS, so they must not
+# run alongside other xdist workers.
+pytestmark = pytest.mark.serial
+
+# Standard embedding size, built once as the float32 buffer pymilvus sends
+_QUERY_VEC = np.full(384, 0.1, dtype=np.float32)
+
+
+async def _check_sql_results(service):
+    results = await service.execute_query("SELECT 1 as test_value")
+    if isinstance(results, list) and results:
+        assert "test_value" in results[0], "SQL query should return expected column"
+    return results
+
+
 # Real database tests
 @pytest.mark.integration
-async def test_real_database_connectivity():
-    """Test actual database connections without mocking."""
-    from services.unified_database_service import MilvusSearchService, Neo4jSearchService, SQLServerSearchService
-    
-    # Test Milvus connection
-    milvus_service = MilvusSearchService()
-    try:
-        milvus_healthy = await milvus_service.connect()
-        assert isinstance(milvus_healthy, bool), "Milvus connect should return boolean"
-        
-        if milvus_healthy:
-            # Test actual search operation
-            results = await milvus_service.search_by_vector(
-                embedding=[0.1] * 384,  # Standard embedding size
+@pytest.mark.parametrize(
+    "service_name,query",
+    [
+        (
+            "MilvusSearchService",
+            lambda service: service.search_by_vector(
+                embedding=_QUERY_VEC,
                 collection="test_collection",
                 limit=1
-            )
-            assert isinstance(results, list), "Milvus search should return list"
-    except Exception as e:
-        pytest.skip(f"Milvus not available: {e}")
-    
-    # Test Neo4j connection
-    neo4j_service = Neo4jSearchService()
-    try:
-        neo4j_healthy = await neo4j_service.connect()
-        assert isinstance(neo4j_healthy, bool), "Neo4j connect should return boolean"
-        
-        if neo4j_healthy:
-            # Test actual query
-            results = await neo4j_service.search_nodes("test", limit=1)
-            assert isinstance(results, list), "Neo4j search should return list"
-    except Exception as e:
-        pytest.skip(f"Neo4j not available: {e}")
-    
-    # Test SQL Server connection
-    sql_service = SQLServerSearchService()
+            ),
+        ),
+        ("Neo4jSearchService", lambda service: service.search_nodes("test", limit=1)),
+        ("SQLServerSearchService", _check_sql_results),
+    ],
+    ids=["milvus", "neo4j", "sql_server"],
+)
+async def test_real_database_connectivity(service_name, query):
+    """Test each backend's actual connection and one query without mocking.
+
+    A backend that fails to connect or to answer a health check skips with
+    its reason; one that is up must answer the query.
+    """
+    import services.unified_database_service as unified_database_service
+
     try:
-        sql_healthy = await sql_service.connect()
-        assert isinstance(sql_healthy, bool), "SQL connect should return boolean"
-        
-        if sql_healthy:
-            # Test actual query
-            results = await sql_service.execute_query("SELECT 1 as test_value")
-            assert isinstance(results, list), "SQL query should return list"
-            if results:
-                assert "test_value" in results[0], "SQL query should return expected column"
+        service = getattr(unified_database_service, service_name)()
+        connected = await service.connect()
     except Exception as e:
-        pytest.skip(f"SQL Server not available: {e}")
+        pytest.skip(f"{service_name} not available: {e}")
+    assert isinstance(connected, bool), f"{service_name} connect should return boolean"
+    if not connected:
+        pytest.skip(f"{service_name} not available: connect() returned False")
+    if not await service.is_healthy():
+        pytest.skip(f"{service_name} not available: health check failed")
+
+    results = await query(service)
+    assert isinstance(results, list), f"{service_name} query should return list"
 
 
 @pytest.mark.integration
@@ -146,21 +152,15 @@ async def test_concurrent_operations():
     llm_client = LLMClient()
     tot_tool = TreeOfThoughtTool(llm_client)
     
-    # Run multiple operations concurrently
-    tasks = []
-    for i in range(5):
-        task = tot_tool.execute(
-            prompt=f"Analyze approach {i} for solving concurrent testing",
-            branches=2,
-            depth=1
-        )
-        tasks.append(task)
-    
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # One batched LLM call per tree level instead of one call per prompt
+    results = await tot_tool.execute_many(
+        [f"Analyze approach {i} for solving concurrent testing" for i in range(5)],
+        branches=2,
+        depth=1
+    )
     
-    # Verify all completed without errors
+    assert isinstance(results, list) and len(results) == 5, "Should return one result per prompt"
     for i, result in enumerate(results):
-        assert not isinstance(result, Exception), f"Task {i} failed with exception: {result}"
         assert isinstance(result, dict), f"Task {i} should return dict"
         assert result.get("status") in ["success", "error"], f"Task {i} should have valid status"
 
@@ -183,34 +183,37 @@ async def test_error_recovery():
 @pytest.mark.integration
 async def test_memory_usage():
     """Test memory usage patterns under load."""
-    import psutil
     import gc
+    import tracemalloc
     
-    process = psutil.Process()
-    initial_memory = process.memory_info().rss
-    
-    # Create and destroy many objects
     from project_state import ProjectState
     
-    states = []
-    for i in range(100):
-        state = ProjectState()
-        await state.update_state(f"key_{i}", f"value_{i}" * 100)  # Create some data
-        states.append(state)
-    
-    peak_memory = process.memory_info().rss
-    
-    # Clean up
-    del states
-    gc.collect()
-    
-    final_memory = process.memory_info().rss
+    # tracemalloc counts Python allocations exactly, unlike noisy process RSS
+    tracemalloc.start()
+    try:
+        initial = tracemalloc.take_snapshot()
+        
+        # Create and destroy many objects
+        states = []
+        for i in range(100):
+            state = ProjectState()
+            await state.update_state(f"key_{i}", f"value_{i}" * 100)  # Create some data
+            states.append(state)
+        
+        peak = tracemalloc.take_snapshot()
+        
+        # Clean up
+        del states
+        gc.collect()
+        
+        final = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
     
-    # Memory should not grow unboundedly
-    memory_growth = peak_memory - initial_memory
-    memory_recovered = peak_memory - final_memory
+    memory_growth = sum(stat.size_diff for stat in peak.compare_to(initial, "lineno"))
+    memory_recovered = sum(stat.size_diff for stat in peak.compare_to(final, "lineno"))
     
-    assert memory_growth < 100 * 1024 * 1024, "Memory growth should be reasonable"  # Less than 100MB
+    assert memory_growth < 10 * 1024 * 1024, "Memory growth should be reasonable"  # Less than 10MB
     assert memory_recovered > 0, "Memory should be recoverable"
 
 
@@ -225,7 +228,7 @@ async def test_data_consistency():
     async def writer(key, value, iterations):
         for i in range(iterations):
             await state.update_state(key, f"{value}_{i}")
-            await asyncio.sleep(0.001)  # Small delay
+            await asyncio.sleep(0)  # Yield so the writers interleave
     
     # Run concurrent writers
     await asyncio.gather(
@@ -236,4 +239,21 @@ async def test_data_consistency():
     # Final value should be from one of the writers
     final_value = state.get_state("test_key")
     assert final_value is not None, "Final value should exist"
-    assert ("writer_a" in final_value or "writer_b" in final_value), "Final value should be from a writer"
\ No newline at end of file
+    assert ("writer_a" in final_value or "writer_b" in final_value), "Final value should be from a writer"
+
+
+@pytest.mark.integration
+async def test_batch_state_update():
+    """Test batched state writes land together and match per-key writes."""
+    from project_state import ProjectState
+
+    items = {f"key_{i}": f"value_{i}" for i in range(100)}
+
+    batched = ProjectState()
+    await batched.update_state_many(items)
+
+    single = ProjectState()
+    for key, value in items.items():
+        await single.update_state(key, value)
+
+    assert batched.get_all_state() == single.get_all_state() == items
@@ -0,0 +1,52 @@
+"""Tests for the /retrieve endpoint."""
+from collections import namedtuple
+from types import MappingProxyType
+from unittest.mock import AsyncMock
+
+import pytest
+
+from routes import retrieve
+
+# Shared arrange data, built once at import and read-only so tests cannot mutate it.
+_EMBEDDING = (0.1, 0.2, 0.3)
+MilvusHit = namedtuple("MilvusHit", "id distance entity")
+_MILVUS_HITS = (
+    (MilvusHit("1", 0.1, MappingProxyType({"document_id": "doc1", "text": "milvus text"})),),
+)
+_EXPECTED_RESULTS = [
+    {"id": "1", "distance": 0.1, "document_id": "doc1", "text": "milvus text"}
+]
+
+
+class _MilvusClient:
+    """Plain Milvus client double; no context-manager hooks to confuse the route."""
+
+    def search(self, **kwargs):
+        return _MILVUS_HITS
+
+
+_MILVUS_CLIENT = _MilvusClient()
+
+
+@pytest.mark.parametrize(
+    "embedding,milvus_client,status_code,body",
+    [
+        (_EMBEDDING, _MILVUS_CLIENT, 200, {"results": _EXPECTED_RESULTS}),
+        (None, _MILVUS_CLIENT, 500, {"error": "Failed to generate query embedding."}),
+        (_EMBEDDING, None, 500, {"error": "Failed to connect to Milvus."}),
+    ],
+    ids=["success", "embedding_failure", "milvus_failure"],
+)
+def test_retrieve(
+    client, db_mocks, monkeypatch, embedding, milvus_client, status_code, body
+):
+    """Retrieve returns Milvus hits or the matching error for each failure point."""
+    monkeypatch.setattr(
+        retrieve.embedding_service, "get_embedding", AsyncMock(return_value=embedding)
+    )
+    db_mocks.milvus = milvus_client
+
+    response = client.post("/retrieve", json={"query": "test query"})
+
+    assert response.status_code == status_code
+    assert response.json() == body
@@ -0,0 +1,92 @@
+"""Tests for the semantic LLM prompt cache."""
+import pytest
+
+from services.semantic_cache import CachedLLMClient, SemanticCache
+from tests.conftest import MockLLMClient
+
+# Hand-picked vectors: "paraphrase" is ~0.99 cosine to "original", "unrelated" ~0.
+_VECTORS = {
+    "original": [1.0, 0.0, 0.0],
+    "paraphrase": [0.99, 0.1, 0.0],
+    "unrelated": [0.0, 0.0, 1.0],
+}
+
+
+async def _fake_embed(text):
+    return _VECTORS[text]
+
+
+@pytest.fixture
+def cached_client():
+    llm = MockLLMClient(response="answer")
+    return llm, CachedLLMClient(llm, SemanticCache(embed_fn=_fake_embed))
+
+
+async def test_exact_and_semantic_hits_skip_the_llm(cached_client):
+    llm, client = cached_client
+    assert await client.invoke("original") == "answer"
+    assert await client.invoke("original") == "answer"
+    assert await client.invoke("paraphrase") == "answer"
+    assert llm.prompts == ["original"]
+    assert (client.cache.hits, client.cache.semantic_hits) == (1, 1)
+
+
+async def test_dissimilar_prompt_misses(cached_client):
+    llm, client = cached_client
+    await client.invoke("original")
+    await client.invoke("unrelated")
+    assert llm.prompts == ["original", "unrelated"]
+
+
+async def test_invoke_batch_sends_only_misses_upstream(cached_client):
+    llm, client = cached_client
+    await client.invoke("original")
+    results = await client.invoke_batch(["paraphrase", "unrelated"])
+    assert results == ["answer", "answer"]
+    assert llm.prompts == ["original", "unrelated"]
+
+
+async def test_error_responses_and_explicit_params_bypass_cache():
+    llm = MockLLMClient(response="Error: upstream timeout")
+    client = CachedLLMClient(llm, SemanticCache(embed_fn=_fake_embed))
+    await client.invoke("original")
+    await client.invoke("original", temperature=0.2)
+    assert len(client.cache) == 0
+    assert len(llm.prompts) == 2
+
+
+async def test_scope_fn_keeps_semantic_matches_within_a_template():
+    llm = MockLLMClient(response="answer")
+    cache = SemanticCache(
+        embed_fn=_fake_embed, scope_fn=lambda prompt: tuple(prompt.split(":", 1))
+    )
+    client = CachedLLMClient(llm, cache)
+    await client.invoke("generate:original")
+    await client.invoke("evaluate:paraphrase")
+    await client.invoke("generate:paraphrase")
+    assert llm.prompts == ["generate:original", "evaluate:paraphrase"]
+    assert cache.semantic_hits == 1
+
+
+async def test_evicted_prompt_no_longer_matches_semantically():
+    llm = MockLLMClient(response="answer")
+    client = CachedLLMClient(llm, SemanticCache(embed_fn=_fake_embed, max_entries=1))
+    await client.invoke("original")
+    await client.invoke("unrelated")
+    await client.invoke("paraphrase")
+    assert llm.prompts == ["original", "unrelated", "paraphrase"]
+    assert client.cache.semantic_hits == 0
+
+
+async def test_expired_entries_miss_exactly_and_semantically(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("services.semantic_cache.time.monotonic", lambda: now[0])
+    llm = MockLLMClient(response="answer")
+    client = CachedLLMClient(llm, SemanticCache(embed_fn=_fake_embed, ttl=60))
+    await client.invoke("original")
+    now[0] += 61
+    await client.invoke("paraphrase")
+    now[0] += 61
+    await client.invoke("original")
+    assert llm.prompts == ["original", "paraphrase", "original"]
+    assert (client.cache.hits, client.cache.semantic_hits) == (0, 0)
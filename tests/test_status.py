@@ -0,0 +1,58 @@
+"""Tests for the /status endpoint."""
+import pytest
+
+_BACKENDS = ("milvus", "neo4j", "sql_server")
+_FIXTURE_ATTRS = {"milvus": "milvus", "neo4j": "neo4j", "sql_server": "sql"}
+
+
+@pytest.mark.parametrize(
+    "disconnected",
+    [(), ("milvus",), ("neo4j",), ("sql_server",), _BACKENDS],
+    ids=[
+        "all_connected",
+        "milvus_disconnected",
+        "neo4j_disconnected",
+        "sql_server_disconnected",
+        "all_disconnected",
+    ],
+)
+def test_status(client, db_mocks, disconnected):
+    """Each backend is reported connected unless its getter yields nothing."""
+    for backend in disconnected:
+        setattr(db_mocks, _FIXTURE_ATTRS[backend], None)
+
+    response = client.get("/status")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "running",
+        "databases": {
+            backend: "disconnected" if backend in disconnected else "connected"
+            for backend in _BACKENDS
+        },
+    }
+
+
+_GETTERS = {
+    "milvus": "utils.get_shared_milvus_client",
+    "neo4j": "utils.get_shared_neo4j_driver",
+    "sql_server": "utils.get_sql_server_connection",
+}
+
+
+@pytest.mark.parametrize("failing", _BACKENDS, ids=lambda b: f"{b}_general_exception")
+def test_status_general_exception(client, db_mocks, monkeypatch, failing):
+    """A backend check that raises is reported disconnected, not a 500."""
+
+    async def raise_error():
+        raise RuntimeError("backend exploded")
+
+    monkeypatch.setattr(_GETTERS[failing], raise_error)
+
+    response = client.get("/status")
+
+    assert response.status_code == 200
+    assert response.json()["databases"] == {
+        backend: "disconnected" if backend == failing else "connected"
+        for backend in _BACKENDS
+    }